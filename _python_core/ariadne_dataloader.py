@@ -1,17 +1,27 @@
-from typing import Any, Dict, List, TypeVar
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional, TypeVar
 
 from aiodataloader import DataLoader
 from bson.objectid import ObjectId
 
 import _python_core.Errors as err
+from _python_core.crud.crud_constants import ACTIVE, DELETED_USER
+from _python_core.crud.crud_options import CrudOptions
+from _python_core.reference_cache import referenceCache
 
 TObject = TypeVar("TObject", bound="DataLoader")
+TFields = Optional[FrozenSet[str]]  # None: whole document
+
+DEFAULT_MAX_BATCH_SIZE = 1000
 
 
 class AriadneDataLoader(DataLoader):
     def __init__(self, context: Any, objMany: Any, *args: Any, **kwargs: Any) -> None:
         self.context = context
         self.objMany = objMany
+        self.requestedFields: Dict[str, TFields] = {}
+        self.loadedFields: Dict[str, TFields] = {}
+        # Very large batches are split in several queries
+        kwargs.setdefault("max_batch_size", DEFAULT_MAX_BATCH_SIZE)
 
         super().__init__(*args, **kwargs)
 
@@ -21,10 +31,14 @@ class AriadneDataLoader(DataLoader):
         if not (key := objMany.collection):
             raise err.ErrorBase(f"Data loader {cls} does not define a context key")
 
+        return cls._get_loader(context, key, objMany=objMany)
+
+    @classmethod
+    def _get_loader(cls: TObject, context: Any, key: Hashable, **kwargs: Any) -> Any:
         loaders = context.setdefault("loaders", {})
 
         if key not in loaders:
-            loaders[key] = cls(context=context, objMany=objMany)
+            loaders[key] = cls(context=context, **kwargs)
 
         loader = loaders[key]
         if not isinstance(loader, cls):
@@ -32,14 +46,149 @@ class AriadneDataLoader(DataLoader):
 
         return loader
 
+    def load(self, key: Any) -> Any:
+        # Plain loads need the whole document, even when a projected load got the key first
+        return self.load_with_projection(key)
+
+    def load_with_projection(self, id: str, projection: Optional[Dict] = None) -> Any:
+        """Loads id with, at least, the fields of projection (the whole document when None).
+
+        The projections of all the keys in a batch are merged, so one query serves them all.
+        """
+        if id is None:
+            return super().load(id)
+        id = str(id)
+        fields: TFields = frozenset(projection) if projection else None
+        if id in self.loadedFields and not _covers(self.loadedFields[id], fields):
+            # Already loaded with fewer fields
+            self.clear(id)
+            del self.loadedFields[id]
+        if id not in self.loadedFields:
+            self.requestedFields[id] = _merge(self.requestedFields.get(id, frozenset()), fields)
+        return super().load(id)
+
     async def batch_load_fn(self, ids: List[str]) -> List[Dict | None]:
-        query = {"$or": [{"_id": ObjectId(id)} for id in ids]}
-        data = await self.objMany.get_all(**query)
+        uniqueIds: List[str] = list(dict.fromkeys(map(str, ids)))
+        fields: TFields = self._get_batch_fields(uniqueIds)
+        dataById: Dict[str, Dict] = self._get_cached_data(uniqueIds)
 
-        result: List[Dict | None] = [None] * len(ids)
-        for index, _id in enumerate(ids):
+        if missingIds := [ObjectId(id) for id in uniqueIds if id not in dataById]:
+            projection: Optional[Dict] = {field: 1 for field in fields} if fields else None
+            # By id: the skip, limit and cursors of the options do not apply
+            data = await self.objMany.get_all_unpaged(
+                **{"_id": {"$in": missingIds}}, projection=projection
+            )
             for obj in data:
-                if str(obj.get("_id")) == _id:
-                    result[index] = obj
+                dataById[str(obj.get("_id"))] = obj
+                if projection is None:
+                    referenceCache.set(self.objMany.collection, obj.get("_id"), obj)
+
+        return [dataById.get(str(id)) for id in ids]
+
+    def prime_entries(self, entries: List[Dict]) -> None:
+        """Entries just written: they are loaded from memory for the rest of the request"""
+        options: CrudOptions = self.objMany.get_crud_options()
+        for entry in entries:
+            if _has_query_filters(options):
+                # Only Mongo can tell if the entry matches them: it is read again when loaded
+                self._forget(str(entry.get("_id")))
+            else:
+                self._replace(str(entry.get("_id")), entry if _is_visible(entry, options) else None)
+
+    def prime_deleted(self, ids: List[str]) -> None:
+        for id in ids:
+            self._replace(str(id), None)
+
+    def _replace(self, id: str, entry: Optional[Dict]) -> None:
+        self.clear(id).prime(id, entry)
+        self.requestedFields.pop(id, None)
+        self.loadedFields[id] = None
+
+    def _forget(self, id: str) -> None:
+        self.clear(id)
+        self.requestedFields.pop(id, None)
+        self.loadedFields.pop(id, None)
+
+    def _get_batch_fields(self, ids: List[str]) -> TFields:
+        fields: TFields = frozenset()
+        for id in ids:
+            # Keys loaded without projection need the whole document
+            fields = _merge(fields, self.requestedFields.pop(id, None))
+        for id in ids:
+            self.loadedFields[id] = fields
+        return fields
+
+    def _get_cached_data(self, ids: List[str]) -> Dict[str, Dict]:
+        collection: str = self.objMany.collection
+        if not referenceCache.is_enabled(collection):
+            return {}
+        cached = {id: referenceCache.get(collection, id) for id in ids}
+        return {id: obj for id, obj in cached.items() if obj is not None}
+
+
+class ForeignKeyDataLoader(AriadneDataLoader):
+    """One-to-many loader: returns, for every key, the entries whose field matches it.
+
+    Loaders are kept per (collection, field), e.g. changelog entries by "parentID" or
+    documents by "project.id". Entries come from objMany.get_all_unpaged: the default filters
+    of its CrudOptions apply, but not its skip, limit or cursors, which would be shared by
+    every key of the batch.
+    """
+
+    def __init__(self, context: Any, objMany: Any, field: str, *args: Any, **kwargs: Any) -> None:
+        self.field = field
+        super().__init__(context, objMany, *args, **kwargs)
+
+    @classmethod
+    def for_context(cls: TObject, context: Any, objMany: Any, field: str) -> Any:
+        if not (collection := objMany.collection):
+            raise err.ErrorBase(f"Data loader {cls} does not define a context key")
+
+        return cls._get_loader(context, (collection, field), objMany=objMany, field=field)
+
+    def load(self, key: Any) -> Any:
+        # Keys are field values, not ids: entries are always loaded whole
+        return DataLoader.load(self, key)
+
+    async def batch_load_fn(self, keys: List[Hashable]) -> List[List[Dict]]:
+        dataByKey: Dict[Hashable, List[Dict]] = {key: [] for key in keys}
+        data = await self.objMany.get_all_unpaged(**{self.field: {"$in": list(dataByKey)}})
+
+        for obj in data:
+            for value in self._get_field_values(obj):
+                if value in dataByKey:
+                    dataByKey[value].append(obj)
+
+        return [dataByKey[key] for key in keys]
+
+    def _get_field_values(self, obj: Dict) -> List[Any]:
+        value: Any = obj
+        for key in self.field.split("."):
+            value = value.get(key) if isinstance(value, dict) else None
+        # Like $in, a list matches any of its elements
+        values: List[Any] = value if isinstance(value, list) else [value]
+        return list({value for value in values if isinstance(value, Hashable)})
+
+
+def _is_visible(entry: Dict, options: CrudOptions) -> bool:
+    # Same flags as the default filters of Crud: deleted and inactive entries may be skipped
+    if options._is_skip_deleted_entries_enable() and DELETED_USER in entry:
+        return False
+    return not options._is_skip_inactive_entries_enable() or entry.get(ACTIVE) in [None, True]
+
+
+def _has_query_filters(options: CrudOptions) -> bool:
+    return bool(
+        options.additionalFilter
+        or options.idsFilter
+        or options._is_date_filter_enabled()
+        or options._is_user_filter_enabled()
+    )
+
+
+def _merge(fields: TFields, otherFields: TFields) -> TFields:
+    return None if fields is None or otherFields is None else fields | otherFields
+
 
-        return result
+def _covers(fields: TFields, requestedFields: TFields) -> bool:
+    return fields is None or (requestedFields is not None and requestedFields <= fields)
@@ -6,7 +6,8 @@ from bson.objectid import ObjectId
 
 from _python_core import functions as fn
 from _python_core import Errors as err
-from _python_core.ariadne_dataloader import AriadneDataLoader
+from _python_core.constants import INFO
+from _python_core.ariadne_dataloader import AriadneDataLoader, ForeignKeyDataLoader
 from _python_core.crud.crud_constants import (
     CREATE_DATE,
     CREATE_USER,
@@ -15,6 +16,8 @@ from _python_core.crud.crud_constants import (
     MODIFIED_DATE,
     MODIFIED_USER,
 )
+from _python_core.crud.crud_engine import CrudEngine
+from _python_core.crud.identity_map import IdentityMap
 from _python_core.crud.crud_many import CrudMany
 from _python_core.crud.crud_options import CrudOptions
 from _python_core.crud.crud_single import CrudOne
@@ -35,17 +38,27 @@ class Base(ABC):
         self.kwargs: Dict = kwargs
 
     @abstractmethod
-    def set_crud(self, ddbb: Any) -> None:
+    def set_crud(
+        self, ddbb: Any, crudOptions: CrudOptions = None, engine: CrudEngine = None
+    ) -> None:
         pass  # pragma: no cover
 
     @abstractmethod
     def set_crud_options(self, options: CrudOptions) -> None:
         pass  # pragma: no cover
 
+    @abstractmethod
+    def get_crud_options(self) -> CrudOptions:
+        pass  # pragma: no cover
+
     @abstractmethod
     async def get_all(self, **filter: Dict) -> List[TData]:
         pass  # pragma: no cover
 
+    @abstractmethod
+    async def get_all_unpaged(self, **filter: Any) -> List[TData]:
+        pass  # pragma: no cover
+
     @abstractmethod
     async def get_single(self, **filter: Any) -> TData:
         pass  # pragma: no cover
@@ -55,7 +68,15 @@ class Base(ABC):
         pass  # pragma: no cover
 
     @abstractmethod
-    async def get_with_limit(self, limit: int = 1, sort: List[Tuple] = [], **filter: Any) -> TData:
+    async def get_by_ids(
+        self, ids: List[Union[str, ObjectId]], projection: Optional[Dict] = None
+    ) -> List[Optional[TData]]:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    async def get_with_limit(
+        self, limit: int = 1, sort: Optional[List[Tuple]] = None, **filter: Any
+    ) -> TData:
         pass  # pragma: no cover
 
     @abstractmethod
@@ -104,6 +125,19 @@ class Base(ABC):
     def return_mutation(self) -> ResponseGQL:
         pass  # pragma: no cover
 
+    def _get_loader(self) -> Optional[AriadneDataLoader]:
+        # Loader of the request, when the resolver info was provided
+        info: Any = self.kwargs.get(INFO)
+        return AriadneDataLoader.for_context(info.context, self) if info else None
+
+    def _prime_loader(self, entries: List[TData]) -> None:
+        if entries and (loader := self._get_loader()):
+            loader.prime_entries(entries)
+
+    def _prime_loader_deleted(self, ids: List[str]) -> None:
+        if ids and (loader := self._get_loader()):
+            loader.prime_deleted(ids)
+
 
 class BaseMany(Base):
     def __init__(self, **kwargs: Dict) -> None:
@@ -134,8 +168,10 @@ class BaseMany(Base):
         if hasattr(self, "handlerCrudMany"):
             self.handlerCrudMany.set_language(lang)
 
-    def set_crud(self, ddbb: Any, crudOptions: CrudOptions = None) -> None:
-        self.handlerCrudMany: CrudMany = CrudMany(ddbb, self.lang)
+    def set_crud(
+        self, ddbb: Any, crudOptions: CrudOptions = None, engine: CrudEngine = None
+    ) -> None:
+        self.handlerCrudMany: CrudMany = CrudMany(ddbb, self.lang, engine)
         self.handlerCrudMany.set_collection(self.collection)
         self.handlerCrudMany.set_language(self.lang)
 
@@ -146,6 +182,12 @@ class BaseMany(Base):
         options.set_language(self.lang)
         self.handlerCrudMany.set_options(options)
 
+    def get_crud_options(self) -> CrudOptions:
+        return self.handlerCrudMany.options
+
+    def set_identity_map(self, identityMap: Optional[IdentityMap]) -> None:
+        self.handlerCrudMany.set_identity_map(identityMap)
+
     @abstractmethod
     def set_schemas(self, entries: List[TData]) -> None:
         pass  # pragma: no cover
@@ -153,14 +195,24 @@ class BaseMany(Base):
     async def get_all(self, **filter: Dict) -> List[TData]:
         return await self.handlerCrudMany.get(**filter)
 
-    async def get_single(self, sort: List[Tuple] = [], **filter: Any) -> TData:
+    async def get_all_unpaged(self, **filter: Any) -> List[TData]:
+        return await self.handlerCrudMany.get_unpaged(**filter)
+
+    async def get_single(self, sort: Optional[List[Tuple]] = None, **filter: Any) -> TData:
         return await self.handlerCrudMany.get_single(sort, **filter)
 
     async def get_by_id(self, id: Union[str, ObjectId], **filter: Any) -> TData:
         return await self.handlerCrudMany.get_by_id(id, **filter)
 
-    async def get_with_limit(self, limit: int = 1, sort: List[Tuple] = [], **filter: Any) -> TData:
-        return await self.handlerCrudMany.get_with_limit(limit, *sort, **filter)
+    async def get_by_ids(
+        self, ids: List[Union[str, ObjectId]], projection: Optional[Dict] = None
+    ) -> List[Optional[TData]]:
+        return await self.handlerCrudMany.get_by_ids(ids, projection)
+
+    async def get_with_limit(
+        self, limit: int = 1, sort: Optional[List[Tuple]] = None, **filter: Any
+    ) -> TData:
+        return await self.handlerCrudMany.get_with_limit(limit, sort, **filter)
 
     def get_errors(self) -> List:
         return self.errors + (
@@ -213,6 +265,7 @@ class BaseMany(Base):
         entries: List[TData] = self.validSchemas if only_valid else self.schemas
         if entries and not (self._is_bulk_upload() and len(self.inValidSchemas) > 0):
             await self.handlerCrudMany.insert_update(entries)
+            self._prime_loader(self.handlerCrudMany.get_data())
 
     async def delete(self) -> None:
         self.reset_errors()
@@ -237,6 +290,9 @@ class BaseMany(Base):
         if entries:
             ids = [str(entry.get("_id")) for entry in entries]
             await self.handlerCrudMany.delete(ids)
+            self._prime_loader_deleted(
+                [entry.get("_id") for entry in self.handlerCrudMany.get_data()]
+            )
 
     def reset_errors(self) -> None:
         self.errors = []
@@ -269,12 +325,16 @@ class BaseOne(Base):
             self.get_http_code(), [self.get_message()], [self.get_error()], [self.get_data()]
         )
 
-    def set_crud(self, ddbb: Any, crudOptions: CrudOptions = None) -> None:
-        self._set_internal_crud(ddbb, crudOptions)
+    def set_crud(
+        self, ddbb: Any, crudOptions: CrudOptions = None, engine: CrudEngine = None
+    ) -> None:
+        self._set_internal_crud(ddbb, crudOptions, engine)
         self._set_crud_for_validator()
 
-    def _set_internal_crud(self, ddbb: Any, crudOptions: CrudOptions = None) -> None:
-        self.handlerCrudSingle: CrudOne = CrudOne(ddbb, self.lang)
+    def _set_internal_crud(
+        self, ddbb: Any, crudOptions: CrudOptions = None, engine: CrudEngine = None
+    ) -> None:
+        self.handlerCrudSingle: CrudOne = CrudOne(ddbb, self.lang, engine)
         self.handlerCrudSingle.set_collection(self.collection)
         self.handlerCrudSingle.set_language(self.lang)
 
@@ -288,6 +348,13 @@ class BaseOne(Base):
         options.set_language(self.lang)
         self.handlerCrudSingle.set_options(options)
 
+    def get_crud_options(self) -> CrudOptions:
+        return self.handlerCrudSingle.options
+
+    def set_identity_map(self, identityMap: Optional[IdentityMap]) -> None:
+        # e.g. IdentityMap.for_context(info.context): reads by _id shared by the whole request
+        self.handlerCrudSingle.set_identity_map(identityMap)
+
     def set_schema(self, entry: TData) -> None:
         self.schema = entry
 
@@ -312,22 +379,38 @@ class BaseOne(Base):
     async def get_all(self, **filter: Dict) -> List[TData]:
         return await self.handlerCrudSingle.get(**filter)
 
+    async def get_all_unpaged(self, **filter: Any) -> List[TData]:
+        return await self.handlerCrudSingle.get_unpaged(**filter)
+
     async def get_single(self, **filter: Any) -> TData:
         return await self.handlerCrudSingle.get_single(**filter)
 
     async def get_by_id(self, id: Union[str, ObjectId], **filter: Any) -> TData:
         return await self.handlerCrudSingle.get_by_id(id, **filter)
 
-    async def get_with_limit(self, limit: int = 1, sort: List[Tuple] = [], **filter: Any) -> TData:
-        return await self.handlerCrudSingle.get_with_limit(limit, *sort, **filter)
+    async def get_by_ids(
+        self, ids: List[Union[str, ObjectId]], projection: Optional[Dict] = None
+    ) -> List[Optional[TData]]:
+        return await self.handlerCrudSingle.get_by_ids(ids, projection)
+
+    async def get_with_limit(
+        self, limit: int = 1, sort: Optional[List[Tuple]] = None, **filter: Any
+    ) -> TData:
+        return await self.handlerCrudSingle.get_with_limit(limit, sort, **filter)
 
-    async def reference_resolver(self, info: Any) -> Optional[Dict]:
+    async def reference_resolver(self, info: Any, useProjection: bool = False) -> Optional[Dict]:
+        # useProjection: only read the fields selected by the client
         data_id: Optional[str] = self._getIDFromEntry(raiseException=False)
-        return (
-            await AriadneDataLoader.for_context(info.context, self).load(data_id)
-            if fn.isValidObjectId(data_id)
-            else None
-        )
+        if not fn.isValidObjectId(data_id):
+            return None
+
+        loader: AriadneDataLoader = AriadneDataLoader.for_context(info.context, self)
+        if useProjection:
+            return await loader.load_with_projection(data_id, fn.get_projection_from_info(info))
+        return await loader.load(data_id)
+
+    async def reference_list_resolver(self, info: Any, field: str, value: Any) -> List[Dict]:
+        return await ForeignKeyDataLoader.for_context(info.context, self, field).load(value)
 
     async def insert_update(self) -> None:
         await self.validate_to_insertUpdate()
@@ -336,6 +419,7 @@ class BaseOne(Base):
     async def insert_update_after_validation(self) -> None:
         await self.handlerCrudSingle.insert_update(self.schema)
         self._postprocess()
+        self._prime_loader([self.data] if self.data else [])
 
     def _postprocess(self) -> None:
         self.message = self.handlerCrudSingle.get_message()
@@ -351,6 +435,7 @@ class BaseOne(Base):
         _id = self._getIDFromEntry()
         await self.handlerCrudSingle.delete(_id)
         self._postprocess()
+        self._prime_loader_deleted([_id] if self.data else [])
 
     def _is_empty(self) -> bool:
         if self._is_empty_data():
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from pymongo.database import Database
+
+from _python_core import Errors as err
+from _python_core.crud.crud_engine import CrudEngine, ThreadPoolEngine
+from _python_core.history import History
+
+TData = Dict[str, Any]  # Type object as defined in GQL Schema
+
+DEFAULT_MAX_QUEUE_SIZE = 10000
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 1.0  # seconds
+
+
+class ChangelogWriter:
+    """Write-behind persistence of changelog entries.
+
+    Entries wait in a bounded in-process queue and are written with insert_many once
+    batch_size entries are queued or every flush_interval seconds. When the queue is full,
+    callers wait until there is room again. Call close() on shutdown to drain the queue.
+    Entries still queued when the process dies are lost: Crud objects without a writer keep
+    saving the changelog inline.
+
+    Without an engine, the writes run in a one thread ThreadPoolEngine, so a flush never
+    blocks the event loop. Pass a MotorEngine when mongoDB is a Motor database.
+    """
+
+    def __init__(
+        self,
+        mongoDB: Database,
+        engine: Optional[CrudEngine] = None,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ) -> None:
+        self.mongo: Any = mongoDB[History.collection]
+        self.engine: CrudEngine = engine or ThreadPoolEngine(max_workers=1)
+        self.max_queue_size: int = max_queue_size
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval
+        self.closed: bool = False
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._enqueued: int = 0
+        self._written: int = 0
+        self._flushes: int = 0
+        self._failed_flushes: int = 0
+        self._failed_entries: int = 0
+        self._last_error: str = ""
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "queueDepth": self._queue.qsize() if self._queue else 0,
+            "maxQueueSize": self.max_queue_size,
+            "enqueued": self._enqueued,
+            "written": self._written,
+            "flushes": self._flushes,
+            "failedFlushes": self._failed_flushes,
+            "failedEntries": self._failed_entries,
+            "lastError": self._last_error,
+        }
+
+    async def put(self, entries: List[TData]) -> None:
+        if self.closed:
+            raise err.ErrorBase("Changelog writer is closed")
+        self._start()
+        for entry in entries:
+            if self.closed:
+                raise err.ErrorBase("Changelog writer is closed")
+            if self._queue.qsize() + 1 >= self.batch_size or self._queue.full():
+                self._wakeup.set()
+            await self._queue.put(entry)
+            self._enqueued += 1
+            if self._is_task_finished():
+                # Closed (or dead) while waiting for room: nobody else will write it
+                await self._write_queued()
+
+    async def flush(self) -> None:
+        if self._queue is None:
+            return
+        if self._is_task_finished():
+            await self._write_queued()
+            return
+        self._wakeup.set()
+        await self._queue.join()
+
+    async def close(self) -> None:
+        self.closed = True
+        if not self._is_task_finished():
+            self._wakeup.set()
+            await self._task
+        if self._queue is not None:
+            # Left by a dead task, or queued after its last write
+            await self._write_queued()
+        self._task = None
+
+    def _start(self) -> None:
+        # The queue belongs to the event loop it is used in
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        if self._task and self._loop is loop and not self._task.done():
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    def _is_task_finished(self) -> bool:
+        return self._task is None or self._task.done() or self._task.get_loop().is_closed()
+
+    async def _run(self) -> None:
+        while not self.closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._write_queued()
+        await self._write_queued()
+
+    async def _write_queued(self) -> None:
+        while not self._queue.empty():
+            size: int = min(self.batch_size, self._queue.qsize())
+            entries: List[TData] = [self._queue.get_nowait() for _ in range(size)]
+            try:
+                await self.engine.insert_many(self.mongo, entries)
+                self._written += len(entries)
+                self._flushes += 1
+            except Exception as ex:
+                self._failed_flushes += 1
+                self._failed_entries += len(entries)
+                self._last_error = str(ex)
+                logging.error(f"Error writing {len(entries)} changelog entries:{str(ex)}")
+            finally:
+                for _ in entries:
+                    self._queue.task_done()
@@ -1,6 +1,7 @@
+import asyncio
 import copy
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Tuple, TypeVar, Union
+from typing import Any, Dict, Hashable, List, Optional, Tuple, TypeVar, Union
 
 from bson import ObjectId
 from pymongo import DESCENDING, MongoClient
@@ -17,7 +18,19 @@ from _python_core.crud.crud_constants import (
     NAME,
     REQUESTDATE,
 )
+from _python_core.crud.changelog_writer import ChangelogWriter
+from _python_core.crud.crud_engine import CrudEngine, PymongoEngine
+from _python_core.crud.identity_map import IdentityMap
+from _python_core.crud.query_plan import QueryPlan
+from _python_core.crud.keyset_cursor import (
+    decode_cursor,
+    encode_cursor,
+    get_keyset_filter,
+    get_keyset_projection,
+    get_keyset_sort,
+)
 from _python_core.crud.crud_options import CrudOptions
+from _python_core.functions import freeze
 from _python_core.http_codes import HTTPCode
 from _python_core.translations import Translations as tr
 
@@ -27,6 +40,9 @@ TInsertedData = List[TData]
 
 TCrud = TypeVar("TCrud", bound="Crud")
 
+MAX_QUERY_PLANS = 32
+MAX_IDS_PER_QUERY = 10000  # keeps every $in query far below the BSON document size limit
+
 
 class ErrorCRUD(err.ErrorBase):
     def __init__(self, msg: str) -> None:
@@ -37,8 +53,14 @@ class ErrorCRUD(err.ErrorBase):
 class Crud(ABC):
     default_sort: List[Tuple] = [(CREATE_DATE, DESCENDING)]
 
-    def __init__(self, mongoDB: Database, lang: str = "en") -> None:
+    def __init__(
+        self, mongoDB: Database, lang: str = "en", engine: Optional[CrudEngine] = None
+    ) -> None:
         self.mongoDB: Database = mongoDB
+        self.engine: CrudEngine = engine or PymongoEngine()
+        self.changelogWriter: Optional[ChangelogWriter] = None
+        self.identityMap: Optional[IdentityMap] = None
+        self.queryPlans: Dict[Hashable, QueryPlan] = {}
         self.options: CrudOptions = CrudOptions(lang=lang)
         self.mongo: MongoClient = None
         self.collection: str = ""
@@ -50,6 +72,15 @@ class Crud(ABC):
     def set_options(self, options: CrudOptions) -> None:
         pass  # pragma: no cover
 
+    def set_engine(self, engine: CrudEngine) -> None:
+        self.engine = engine
+
+    def set_changelog_writer(self, changelogWriter: Optional[ChangelogWriter]) -> None:
+        self.changelogWriter = changelogWriter
+
+    def set_identity_map(self, identityMap: Optional[IdentityMap]) -> None:
+        self.identityMap = identityMap
+
     def _verifyLanguage(self) -> None:
         if self.options.lang != self.lang:
             raise ErrorCRUD(tr.translate("ERROR_CRUDOPTIONS_LANGUAGE_DISCREPANCY", self.lang))
@@ -66,37 +97,155 @@ class Crud(ABC):
     def translate(self, msg: str) -> str:
         pass
 
-    async def get(self, sort: List[Tuple] = [], **filter: Dict) -> List[TData]:
-        sort = self._update_sort(self.options.sort)
-        self.set_default_filters(filter)
-        return list(
-            self.mongo.find(filter, self.options.projection)
-            .sort(sort)
-            .skip(self.options.skip)
-            .limit(self.options.limit)
+    async def get(
+        self, sort: Optional[List[Tuple]] = None, projection: Optional[Dict] = None, **filter: Dict
+    ) -> List[TData]:
+        plan: QueryPlan = self._get_query_plan(self.options.sort)
+        filter = plan.get_filter(filter)
+        if self.options._is_keyset_pagination_enabled():
+            return await self._get_keyset_page(
+                filter, projection, get_keyset_sort(plan.get_sort()), plan.limit
+            )
+        return await self.engine.find(
+            self.mongo,
+            filter,
+            projection if projection is not None else plan.get_projection(),
+            sort=plan.get_sort(),
+            skip=plan.skip,
+            limit=plan.limit,
+        )
+
+    async def get_unpaged(self, projection: Optional[Dict] = None, **filter: Any) -> List[TData]:
+        # Default filters and sort, but every match: skip, limit and cursors are ignored
+        plan: QueryPlan = self._get_query_plan(self.options.sort)
+        return await self.engine.find(
+            self.mongo,
+            plan.get_filter(filter),
+            projection if projection is not None else plan.get_projection(),
+            sort=plan.get_sort(),
         )
 
-    async def get_single(self, sort: List[Tuple] = [], **filter: Any) -> TData:
-        sort = self._update_sort(sort)
-        self.set_default_filters(filter)
-        result: List[TData] = list(self.mongo.find(filter, self.options.projection).sort(sort))
+    async def get_page(self, projection: Optional[Dict] = None, **filter: Any) -> TData:
+        # Keyset pagination: use the returned cursors with CrudOptions.set_cursors
+        plan: QueryPlan = self._get_query_plan(self.options.sort)
+        sort: List[Tuple] = get_keyset_sort(plan.get_sort())
+        filter = plan.get_filter(filter)
+        limit: int = plan.limit
+        entries: List[TData] = await self._get_keyset_page(
+            filter, projection, sort, limit + 1 if limit else 0
+        )
+        more: bool = bool(limit) and len(entries) > limit
+        if more:
+            entries = entries[1:] if self.options.before else entries[:limit]
+
+        return {
+            "data": entries,
+            "pageInfo": {
+                "startCursor": encode_cursor(entries[0], sort) if entries else None,
+                "endCursor": encode_cursor(entries[-1], sort) if entries else None,
+                "hasPreviousPage": more if self.options.before else bool(self.options.after),
+                "hasNextPage": bool(self.options.before) or more,
+            },
+        }
+
+    async def _get_keyset_page(
+        self, filter: Dict, projection: Optional[Dict], sort: List[Tuple], limit: int
+    ) -> List[TData]:
+        backwards: bool = bool(self.options.before)
+        if cursor := self.options.before or self.options.after:
+            try:
+                values: List[Any] = decode_cursor(cursor, sort)
+            except ValueError:
+                raise ErrorCRUD(self.translate("ERROR_INVALID_CURSOR").format(cursor))
+            filter["$and"] = filter.get("$and", []) + [get_keyset_filter(sort, values, backwards)]
+
+        projection = projection if projection is not None else self.options.projection
+        if projection and any(projection.values()):
+            projection = get_keyset_projection(projection, sort)
+        entries: List[TData] = await self.engine.find(
+            self.mongo,
+            filter,
+            projection,
+            sort=[(key, -direction) for key, direction in sort] if backwards else sort,
+            limit=limit,
+        )
+        return entries[::-1] if backwards else entries
+
+    async def count(self, limit: int = 0, estimated: bool = False, **filter: Any) -> int:
+        # limit: stop counting once reached, enough to know if there are at least limit entries
+        filter = self._get_query_plan().get_filter(filter)
+        if estimated and not filter:
+            # Collection metadata: fast, but it also counts orphaned documents in sharded clusters
+            return await self.engine.estimated_document_count(self.mongo)
+        return await self.engine.count_documents(self.mongo, filter, limit)
+
+    async def get_with_total(self, projection: Optional[Dict] = None, **filter: Any) -> TData:
+        data, total = await asyncio.gather(
+            self.get(projection=projection, **copy.deepcopy(filter)), self.count(**filter)
+        )
+        return {"data": data, "total": total}
+
+    async def get_single(self, sort: Optional[List[Tuple]] = None, **filter: Any) -> TData:
+        plan: QueryPlan = self._get_query_plan(sort or [])
+        result: List[TData] = await self.engine.find(
+            self.mongo, plan.get_filter(filter), plan.get_projection(), sort=plan.get_sort()
+        )
         return result[0] if result else {}
 
     async def get_with_limit(
-        self, limit: int = 1, sort: List[Tuple] = [], **filter: Any
+        self, limit: int = 1, sort: Optional[List[Tuple]] = None, **filter: Any
     ) -> List[TData]:
 
         if limit <= 0:
             raise ErrorCRUD(self.translate("ERROR_LIMIT_TOO_LOW").format(limit))
 
-        sort = self._update_sort(sort)
-        self.set_default_filters(filter)
-        return list(self.mongo.find(filter, self.options.projection).sort(sort).limit(limit))
+        plan: QueryPlan = self._get_query_plan(sort or [])
+        return await self.engine.find(
+            self.mongo,
+            plan.get_filter(filter),
+            plan.get_projection(),
+            sort=plan.get_sort(),
+            limit=limit,
+        )
+
+    def _get_query_plan(self, sort: Optional[List[Tuple]] = None) -> QueryPlan:
+        # Built again only when the options (or the sort asked for) change
+        sort = self.options.sort if sort is None else sort
+        key: Hashable = freeze(
+            [
+                sort,
+                self.default_sort,
+                self.options.projection,
+                self.options.skip,
+                self.options.limit,
+                self.options.skipDeletedEntries,
+                self.options.skipInactiveEntries,
+                self.options.additionalFilter,
+                self.options.idsFilter,
+                self.options.dateFilter,
+                self.options.filterByUser,
+                self.options.userId,
+            ]
+        )
+        if plan := self.queryPlans.get(key):
+            return plan
+
+        defaultFilter: Dict = {}
+        self.set_default_filters(defaultFilter)
+        plan = QueryPlan.build(
+            defaultFilter,
+            self._update_sort(sort),
+            self.options.projection,
+            self.options.skip,
+            self.options.limit,
+        )
+        if len(self.queryPlans) >= MAX_QUERY_PLANS:
+            self.queryPlans.clear()
+        self.queryPlans[key] = plan
+        return plan
 
     def _update_sort(self, sort: List[Tuple]) -> List[Tuple]:
-        default_sort = self._tweak_default_entry(sort)
-        sort.extend(default_sort)
-        return sort
+        return list(sort) + self._tweak_default_entry(sort)
 
     def _tweak_default_entry(self, sort: List[Tuple]) -> List[Tuple]:
         default_sort: List[Tuple] = copy.deepcopy(self.default_sort)
@@ -106,10 +255,46 @@ class Crud(ABC):
         return default_sort
 
     async def get_by_id(self, id: Union[str, ObjectId]) -> TData:
-        if self._is_id_a_valid_objectId(id):
-            return self.mongo.find_one({"_id": ObjectId(id)})
-
-        return {}
+        if not self._is_id_a_valid_objectId(id):
+            return {}
+
+        if self.identityMap and self.identityMap.contains(self.collection, id):
+            return self.identityMap.get(self.collection, id)
+        data: TData = await self.engine.find_one(self.mongo, {"_id": ObjectId(id)})
+        self._remember_in_identity_map(id, data)
+        return data
+
+    async def get_by_ids(
+        self, ids: List[Union[str, ObjectId]], projection: Optional[Dict] = None
+    ) -> List[Optional[TData]]:
+        # Results follow the order of ids, with None for the missing and invalid ones
+        objectIds: Dict[str, ObjectId] = {
+            str(id): ObjectId(id) for id in ids if self._is_id_a_valid_objectId(id)
+        }
+        found: Dict[str, Optional[TData]] = {}
+        if projection is None and self.identityMap:
+            for id in objectIds:
+                if self.identityMap.contains(self.collection, id):
+                    found[id] = self.identityMap.get(self.collection, id)
+
+        pending: List[ObjectId] = [_id for id, _id in objectIds.items() if id not in found]
+        for start in range(0, len(pending), MAX_IDS_PER_QUERY):
+            chunk: List[ObjectId] = pending[start : start + MAX_IDS_PER_QUERY]
+            for data in await self.engine.find(self.mongo, {"_id": {"$in": chunk}}, projection):
+                found[str(data["_id"])] = data
+            if projection is None:
+                for _id in chunk:
+                    self._remember_in_identity_map(_id, found.get(str(_id)))
+
+        return [found.get(str(id)) for id in ids]
+
+    def _remember_in_identity_map(self, id: Union[str, ObjectId], data: Optional[TData]) -> None:
+        if self.identityMap:
+            self.identityMap.set(self.collection, id, data)
+
+    def _forget_in_identity_map(self, id: Union[str, ObjectId]) -> None:
+        if self.identityMap:
+            self.identityMap.invalidate(self.collection, id)
 
     def _is_id_a_valid_objectId(self, id: Union[str, ObjectId]) -> bool:
         return ObjectId.is_valid(str(id))
@@ -0,0 +1,325 @@
+import asyncio
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pymongo.collection import Collection
+from pymongo.results import (
+    BulkWriteResult,
+    DeleteResult,
+    InsertManyResult,
+    InsertOneResult,
+    UpdateResult,
+)
+
+TData = Dict[str, Any]  # Type object as defined in GQL Schema
+
+DEFAULT_MAX_WORKERS = 10
+
+
+class CrudEngine(ABC):
+    """Storage engine used by Crud to talk to MongoDB.
+
+    Every call receives the collection it has to work with, so a single engine
+    can be shared by all the Crud objects of a service.
+    """
+
+    @abstractmethod
+    async def find(
+        self,
+        collection: Collection,
+        filter: Dict,
+        projection: Optional[Dict] = None,
+        sort: Optional[List[Tuple]] = None,
+        skip: int = 0,
+        limit: int = 0,
+    ) -> List[TData]:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    async def find_one(
+        self, collection: Collection, filter: Dict, projection: Optional[Dict] = None
+    ) -> Optional[TData]:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    async def count_documents(self, collection: Collection, filter: Dict, limit: int = 0) -> int:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    async def estimated_document_count(self, collection: Collection) -> int:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    async def insert_one(self, collection: Collection, document: TData) -> InsertOneResult:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    async def find_one_and_update(
+        self, collection: Collection, filter: Dict, update: Dict, **kwargs: Any
+    ) -> Optional[TData]:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    async def find_one_and_delete(self, collection: Collection, filter: Dict) -> Optional[TData]:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    async def insert_many(
+        self, collection: Collection, documents: List[TData]
+    ) -> InsertManyResult:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    async def bulk_write(
+        self, collection: Collection, operations: List[Any], ordered: bool = True
+    ) -> BulkWriteResult:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    async def update_many(
+        self, collection: Collection, filter: Dict, update: Dict
+    ) -> UpdateResult:
+        pass  # pragma: no cover
+
+    @abstractmethod
+    async def delete_many(self, collection: Collection, filter: Dict) -> DeleteResult:
+        pass  # pragma: no cover
+
+
+class PymongoEngine(CrudEngine):
+    """Default engine. Calls pymongo directly, blocking the event loop while it waits."""
+
+    async def find(
+        self,
+        collection: Collection,
+        filter: Dict,
+        projection: Optional[Dict] = None,
+        sort: Optional[List[Tuple]] = None,
+        skip: int = 0,
+        limit: int = 0,
+    ) -> List[TData]:
+        return _find(collection, filter, projection, sort, skip, limit)
+
+    async def find_one(
+        self, collection: Collection, filter: Dict, projection: Optional[Dict] = None
+    ) -> Optional[TData]:
+        return collection.find_one(filter, projection)
+
+    async def count_documents(self, collection: Collection, filter: Dict, limit: int = 0) -> int:
+        return collection.count_documents(filter, **_count_options(limit))
+
+    async def estimated_document_count(self, collection: Collection) -> int:
+        return collection.estimated_document_count()
+
+    async def insert_one(self, collection: Collection, document: TData) -> InsertOneResult:
+        return collection.insert_one(document)
+
+    async def find_one_and_update(
+        self, collection: Collection, filter: Dict, update: Dict, **kwargs: Any
+    ) -> Optional[TData]:
+        return collection.find_one_and_update(filter, update, **kwargs)
+
+    async def find_one_and_delete(self, collection: Collection, filter: Dict) -> Optional[TData]:
+        return collection.find_one_and_delete(filter)
+
+    async def insert_many(
+        self, collection: Collection, documents: List[TData]
+    ) -> InsertManyResult:
+        return collection.insert_many(documents)
+
+    async def bulk_write(
+        self, collection: Collection, operations: List[Any], ordered: bool = True
+    ) -> BulkWriteResult:
+        return collection.bulk_write(operations, ordered=ordered)
+
+    async def update_many(
+        self, collection: Collection, filter: Dict, update: Dict
+    ) -> UpdateResult:
+        return collection.update_many(filter, update)
+
+    async def delete_many(self, collection: Collection, filter: Dict) -> DeleteResult:
+        return collection.delete_many(filter)
+
+
+class MotorEngine(CrudEngine):
+    """Non-blocking engine for Motor (or any driver exposing awaitable collection methods).
+
+    The database handed to Crud must be a Motor database, e.g.
+    ``AsyncIOMotorClient(uri)["myDatabase"]``.
+    """
+
+    async def find(
+        self,
+        collection: Any,
+        filter: Dict,
+        projection: Optional[Dict] = None,
+        sort: Optional[List[Tuple]] = None,
+        skip: int = 0,
+        limit: int = 0,
+    ) -> List[TData]:
+        cursor = collection.find(filter, projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        return await cursor.skip(skip).limit(limit).to_list(length=None)
+
+    async def find_one(
+        self, collection: Any, filter: Dict, projection: Optional[Dict] = None
+    ) -> Optional[TData]:
+        return await collection.find_one(filter, projection)
+
+    async def count_documents(self, collection: Any, filter: Dict, limit: int = 0) -> int:
+        return await collection.count_documents(filter, **_count_options(limit))
+
+    async def estimated_document_count(self, collection: Any) -> int:
+        return await collection.estimated_document_count()
+
+    async def insert_one(self, collection: Any, document: TData) -> InsertOneResult:
+        return await collection.insert_one(document)
+
+    async def find_one_and_update(
+        self, collection: Any, filter: Dict, update: Dict, **kwargs: Any
+    ) -> Optional[TData]:
+        return await collection.find_one_and_update(filter, update, **kwargs)
+
+    async def find_one_and_delete(self, collection: Any, filter: Dict) -> Optional[TData]:
+        return await collection.find_one_and_delete(filter)
+
+    async def insert_many(self, collection: Any, documents: List[TData]) -> InsertManyResult:
+        return await collection.insert_many(documents)
+
+    async def bulk_write(
+        self, collection: Any, operations: List[Any], ordered: bool = True
+    ) -> BulkWriteResult:
+        return await collection.bulk_write(operations, ordered=ordered)
+
+    async def update_many(self, collection: Any, filter: Dict, update: Dict) -> UpdateResult:
+        return await collection.update_many(filter, update)
+
+    async def delete_many(self, collection: Any, filter: Dict) -> DeleteResult:
+        return await collection.delete_many(filter)
+
+
+class ThreadPoolEngine(CrudEngine):
+    """Runs the blocking pymongo calls in a bounded thread pool.
+
+    The event loop stays responsive while Mongo answers, without moving to an async driver.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+        self.max_workers: int = max_workers
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="crud-engine"
+        )
+        self._lock = threading.Lock()
+        self._queued: int = 0
+        self._running: int = 0
+        self._completed: int = 0
+
+    def get_metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "maxWorkers": self.max_workers,
+                "queueDepth": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.executor.shutdown(wait=wait)
+
+    async def find(
+        self,
+        collection: Collection,
+        filter: Dict,
+        projection: Optional[Dict] = None,
+        sort: Optional[List[Tuple]] = None,
+        skip: int = 0,
+        limit: int = 0,
+    ) -> List[TData]:
+        return await self._run(_find, collection, filter, projection, sort, skip, limit)
+
+    async def find_one(
+        self, collection: Collection, filter: Dict, projection: Optional[Dict] = None
+    ) -> Optional[TData]:
+        return await self._run(collection.find_one, filter, projection)
+
+    async def count_documents(self, collection: Collection, filter: Dict, limit: int = 0) -> int:
+        return await self._run(collection.count_documents, filter, **_count_options(limit))
+
+    async def estimated_document_count(self, collection: Collection) -> int:
+        return await self._run(collection.estimated_document_count)
+
+    async def insert_one(self, collection: Collection, document: TData) -> InsertOneResult:
+        return await self._run(collection.insert_one, document)
+
+    async def find_one_and_update(
+        self, collection: Collection, filter: Dict, update: Dict, **kwargs: Any
+    ) -> Optional[TData]:
+        return await self._run(collection.find_one_and_update, filter, update, **kwargs)
+
+    async def find_one_and_delete(self, collection: Collection, filter: Dict) -> Optional[TData]:
+        return await self._run(collection.find_one_and_delete, filter)
+
+    async def insert_many(
+        self, collection: Collection, documents: List[TData]
+    ) -> InsertManyResult:
+        return await self._run(collection.insert_many, documents)
+
+    async def bulk_write(
+        self, collection: Collection, operations: List[Any], ordered: bool = True
+    ) -> BulkWriteResult:
+        return await self._run(collection.bulk_write, operations, ordered=ordered)
+
+    async def update_many(
+        self, collection: Collection, filter: Dict, update: Dict
+    ) -> UpdateResult:
+        return await self._run(collection.update_many, filter, update)
+
+    async def delete_many(self, collection: Collection, filter: Dict) -> DeleteResult:
+        return await self._run(collection.delete_many, filter)
+
+    async def _run(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        # Same as loop.run_in_executor, but keeping the concurrent future to track the queue
+        with self._lock:
+            self._queued += 1
+        future: Future = self.executor.submit(self._execute, func, *args, **kwargs)
+        future.add_done_callback(self._discard_if_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def _discard_if_cancelled(self, future: Future) -> None:
+        # A cancelled call never reaches _execute, so it has to leave the queue here
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def _execute(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+
+def _find(
+    collection: Collection,
+    filter: Dict,
+    projection: Optional[Dict],
+    sort: Optional[List[Tuple]],
+    skip: int,
+    limit: int,
+) -> List[TData]:
+    cursor = collection.find(filter, projection)
+    if sort:
+        cursor = cursor.sort(sort)
+    return list(cursor.skip(skip).limit(limit))
+
+
+def _count_options(limit: int) -> Dict:
+    # Mongo rejects {"$limit": 0}, so no limit means not sending it
+    return {"limit": limit} if limit > 0 else {}
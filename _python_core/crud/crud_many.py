@@ -1,12 +1,18 @@
-from typing import Any, Dict, List, Union
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
 
 from bson import ObjectId
 from pymongo import MongoClient
+from pymongo.errors import BulkWriteError
 
 from _python_core import Errors as err
+from _python_core.crud.changelog_writer import ChangelogWriter
 from _python_core.crud.crud import Crud, ErrorCRUD
+from _python_core.crud.crud_engine import CrudEngine
+from _python_core.crud.identity_map import IdentityMap
 from _python_core.crud.crud_options import CrudOptions
 from _python_core.crud.crud_single import CrudOne
+from _python_core.history import History
 from _python_core.http_codes import HTTPCode
 from _python_core.translations import Translations as tr
 
@@ -16,12 +22,14 @@ TInsertedData = List[TData]
 
 
 class CrudMany(Crud):
-    def __init__(self, mongo: MongoClient, lang: str = "en") -> None:
-        super().__init__(mongo, lang)
+    def __init__(
+        self, mongo: MongoClient, lang: str = "en", engine: Optional[CrudEngine] = None
+    ) -> None:
+        super().__init__(mongo, lang, engine)
         self._initialize_values(mongo, lang)
 
     def _initialize_values(self, mongo: Any, lang: str) -> None:
-        self.crud: CrudOne = CrudOne(mongo, lang)
+        self.crud: CrudOne = CrudOne(mongo, lang, self.engine)
         self.crud.set_options(self.options)
         self.schemas: List[TData] = []
         self.messages: List[str] = []
@@ -34,6 +42,18 @@ class CrudMany(Crud):
         self.crud.options = options
         self._verifyLanguage()
 
+    def set_engine(self, engine: CrudEngine) -> None:
+        self.engine = engine
+        self.crud.set_engine(engine)
+
+    def set_changelog_writer(self, changelogWriter: Optional[ChangelogWriter]) -> None:
+        self.changelogWriter = changelogWriter
+        self.crud.set_changelog_writer(changelogWriter)
+
+    def set_identity_map(self, identityMap: Optional[IdentityMap]) -> None:
+        self.identityMap = identityMap
+        self.crud.set_identity_map(identityMap)
+
     def set_language(self, lang: str) -> None:
         self.lang = lang
         self.options.lang = lang
@@ -105,24 +125,136 @@ class CrudMany(Crud):
         self.http_code = http_code.value
 
     async def _process_schema_insert_update(self) -> None:
+        if self.options._is_bulk_write_enabled():
+            await self._process_schema_insert_update_in_bulk()
+            return
+
+        if self.options._is_concurrency_enabled():
+            await self._process_schemas_concurrently(
+                lambda crud, schema: crud.insert_update(schema)
+            )
+            return
+
         for schema in self.schemas:
             try:
                 await self.crud.insert_update(schema)
-                self._transfer_information_to_parent()
+                self._transfer_information_to_parent(self.crud)
             except (AssertionError, ErrorCRUD):
-                self._set_error_from_children()
+                self._set_error_from_children(self.crud)
             except Exception as err:
                 self.errors.append(str(err))
-                self._set_error_from_children()
+                self._set_error_from_children(self.crud)
+
+    async def _process_schema_insert_update_in_bulk(self) -> None:
+        cruds: List[CrudOne] = [self._copy_crud() for _ in self.schemas]
+        valid: List[CrudOne] = [
+            crud for crud, schema in zip(cruds, self.schemas) if self._prepare_entry(crud, schema)
+        ]
+        originals: Dict[ObjectId, TData] = await self._get_original_data(valid)
+
+        pending: List[CrudOne] = []
+        operations: List[Any] = []
+        for crud in valid:
+            if operation := await crud._plan_bulk_write(originals):
+                pending.append(crud)
+                operations.append(operation)
+
+        failed_from: int = await self._bulk_write(operations)
+        for index, crud in enumerate(pending):
+            if index < failed_from:
+                crud._process_after_bulk_write()
+            else:
+                crud._process_after_bulk_write_error()
+
+        await self._save_bulk_changelog(valid)
+        for crud in cruds:
+            if crud.get_error():
+                self._set_error_from_children(crud)
+            else:
+                self._transfer_information_to_parent(crud)
+
+    async def _process_schemas_concurrently(
+        self, process: Callable[[CrudOne, TData], Awaitable[None]]
+    ) -> None:
+        # Every schema gets its own CrudOne, as a CrudOne keeps the state of the entry it processes
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(self.options.concurrency)
+        cruds: List[CrudOne] = [self._copy_crud() for _ in self.schemas]
+
+        async def process_schema(crud: CrudOne, schema: TData) -> Tuple[bool, Optional[str]]:
+            async with semaphore:
+                try:
+                    await process(crud, schema)
+                    return True, None
+                except (AssertionError, ErrorCRUD):
+                    return False, None
+                except Exception as err:
+                    return False, str(err)
+
+        results = await asyncio.gather(
+            *[process_schema(crud, schema) for crud, schema in zip(cruds, self.schemas)]
+        )
+        # gather keeps the input order, so results are transferred as in the sequential loop
+        for crud, (succeeded, exception) in zip(cruds, results):
+            if succeeded:
+                self._transfer_information_to_parent(crud)
+                continue
+            if exception is not None:
+                self.errors.append(exception)
+            self._set_error_from_children(crud)
+
+    def _copy_crud(self) -> CrudOne:
+        crud: CrudOne = CrudOne(self.mongoDB, self.lang, self.engine)
+        crud.set_collection(self.collection)
+        crud.set_options(self.options)
+        crud.set_changelog_writer(self.changelogWriter)
+        crud.set_identity_map(self.identityMap)
+        return crud
+
+    def _prepare_entry(self, crud: CrudOne, schema: TData) -> bool:
+        try:
+            crud._prepare_insert_update(schema)
+            return True
+        except (AssertionError, ErrorCRUD):
+            crud.postprocess()
+        return False
+
+    async def _get_original_data(self, cruds: List[CrudOne]) -> Dict[ObjectId, TData]:
+        ids: List[ObjectId] = [crud.schema["_id"] for crud in cruds if crud.schema.get("_id")]
+        if not ids:
+            return {}
+        entries: List[TData] = await self.engine.find(self.mongo, {"_id": {"$in": ids}})
+        return {entry["_id"]: entry for entry in entries}
+
+    async def _bulk_write(self, operations: List[Any]) -> int:
+        """Returns the index of the first operation that was not written"""
+        if not operations:
+            return 0
+        try:
+            await self.engine.bulk_write(self.mongo, operations, ordered=True)
+        except BulkWriteError as err:
+            return min(error["index"] for error in err.details["writeErrors"])
+        return len(operations)
+
+    async def _save_bulk_changelog(self, cruds: List[CrudOne]) -> None:
+        if not self.options.updateChangeLog:
+            return
+        histories: List[TData] = [crud.history for crud in cruds if crud.history]
+        if not histories:
+            return
+        documents: List[TData] = self.crud._prepare_changelog_documents(histories)
+        if self.changelogWriter:
+            await self.changelogWriter.put(documents)
+        else:
+            await self.engine.insert_many(self.mongoDB[History.collection], documents)
 
-    def _transfer_information_to_parent(self) -> None:
-        self.messages.append(self.crud.get_message())
-        self.data.append(self.crud.get_data())
-        self.http_codes.append(self.crud.get_http_code())
+    def _transfer_information_to_parent(self, crud: CrudOne) -> None:
+        self.messages.append(crud.get_message())
+        self.data.append(crud.get_data())
+        self.http_codes.append(crud.get_http_code())
 
-    def _set_error_from_children(self) -> None:
-        self.errors.append(self.crud.get_error())
-        self.http_codes.append(self.crud.get_http_code())
+    def _set_error_from_children(self, crud: CrudOne) -> None:
+        self.errors.append(crud.get_error())
+        self.http_codes.append(crud.get_http_code())
 
     @request_postprocess
     async def delete(self, ids: List[str]) -> None:  # type: ignore
@@ -134,15 +266,84 @@ class CrudMany(Crud):
         await self._process_schema_delete()
 
     async def _process_schema_delete(self) -> None:
+        if self.options._is_bulk_write_enabled():
+            await self._process_schema_delete_in_bulk()
+            return
+
+        if self.options._is_concurrency_enabled():
+            await self._process_schemas_concurrently(
+                lambda crud, schema: crud.delete(str(schema["_id"]))
+            )
+            return
+
         for schema in self.schemas:
             try:
                 await self.crud.delete(str(schema["_id"]))
-                self._transfer_information_to_parent()
+                self._transfer_information_to_parent(self.crud)
             except (AssertionError, ErrorCRUD):
-                self._set_error_from_children()
+                self._set_error_from_children(self.crud)
             except Exception as err:
                 self.errors.append(str(err))
-                self._set_error_from_children()
+                self._set_error_from_children(self.crud)
+
+    async def _process_schema_delete_in_bulk(self) -> None:
+        cruds: List[CrudOne] = [self._copy_crud() for _ in self.schemas]
+        valid: List[CrudOne] = [
+            crud
+            for crud, schema in zip(cruds, self.schemas)
+            if self._prepare_entry_for_delete(crud, str(schema["_id"]))
+        ]
+        originals: Dict[ObjectId, TData] = await self._get_original_data(valid)
+        auditFields: TData = (
+            self.crud._get_audit_fields_to_delete() if self.options.softDelete else {}
+        )
+
+        deleting: List[CrudOne] = [
+            crud for crud in valid if crud._plan_bulk_delete(originals, auditFields)
+        ]
+        deleted: Set[ObjectId] = await self._bulk_delete(deleting, auditFields)
+        for crud in deleting:
+            if crud.schema["_id"] in deleted:
+                crud._process_after_bulk_delete()
+            else:
+                crud._process_after_bulk_delete_error()
+
+        await self._save_bulk_changelog(deleting)
+        for crud in cruds:
+            if crud.get_error():
+                self._set_error_from_children(crud)
+            else:
+                self._transfer_information_to_parent(crud)
+
+    def _prepare_entry_for_delete(self, crud: CrudOne, id: str) -> bool:
+        try:
+            crud._prepare_delete(id)
+            crud.schema["_id"] = ObjectId(id)
+            return True
+        except (AssertionError, ErrorCRUD):
+            crud.postprocess()
+        return False
+
+    async def _bulk_delete(self, cruds: List[CrudOne], auditFields: TData) -> Set[ObjectId]:
+        """Returns the ids that were actually deleted"""
+        ids: List[ObjectId] = list(dict.fromkeys(crud.schema["_id"] for crud in cruds))
+        if not ids:
+            return set()
+
+        _filter: Dict = {"_id": {"$in": ids}}
+        if not self.options.softDelete:
+            result = await self.engine.delete_many(self.mongo, _filter)
+            if result.deleted_count == len(ids):
+                return set(ids)
+            remaining = await self.engine.find(self.mongo, _filter, {"_id": 1})
+            return set(ids).difference(entry["_id"] for entry in remaining)
+
+        if auditFields:
+            result = await self.engine.update_many(self.mongo, _filter, {"$set": auditFields})
+            if result.matched_count != len(ids):
+                remaining = await self.engine.find(self.mongo, _filter, {"_id": 1})
+                return {entry["_id"] for entry in remaining}
+        return set(ids)
 
     def _reset_messages_errors_http_codes_and_data(self) -> None:
         self._reset_messages()
@@ -1,6 +1,6 @@
 from datetime import datetime
 import json
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Tuple
 from _python_core.constants import DATETIME, EXTRA_INFO
 
 from _python_core.crud.crud_constants import (
@@ -14,12 +14,13 @@ from _python_core.crud.crud_constants import (
     REQUESTDATE,
     UPDATE,
 )
-from _python_core.functions import transform_list_dict_to_list_tuple
+from _python_core.functions import get_projection_from_info, transform_list_dict_to_list_tuple
 from _python_core.Errors import ErrorBase
 from _python_core.translations import Translations as tr
 
 DEFAULT_LIMIT = 0
 DEFAULT_SKIP = 0
+DEFAULT_CONCURRENCY = 1
 
 
 class CrudOptions:
@@ -33,6 +34,11 @@ class CrudOptions:
         self.updateChangeLog: bool = True
         self.actionChangeLog: str = UPDATE
         self.softDelete: bool = True
+        self.bulkWrite: bool = False
+        self.concurrency: int = DEFAULT_CONCURRENCY
+        self.upsert: bool = False
+        self.minimalUpdate: bool = False
+        self.orderedListDiff: bool = False
         self.skipDeletedEntries: bool = True
         self.skipInactiveEntries: bool = True
         self.filterByUser: bool = False
@@ -48,6 +54,8 @@ class CrudOptions:
 
         self.limit: int = DEFAULT_LIMIT
         self.skip: int = DEFAULT_SKIP
+        self.after: str | None = None
+        self.before: str | None = None
 
         self.additionalFilter: Dict = {}
         self.extraInfo: Dict = {}
@@ -72,6 +80,21 @@ class CrudOptions:
     def set_softDelete(self, softDelete: bool) -> None:
         self.softDelete = softDelete
 
+    def set_bulkWrite(self, bulkWrite: bool) -> None:
+        self.bulkWrite = bulkWrite
+
+    def set_concurrency(self, concurrency: int) -> None:
+        self.concurrency = max(concurrency, DEFAULT_CONCURRENCY)
+
+    def set_upsert(self, upsert: bool) -> None:
+        self.upsert = upsert
+
+    def set_minimalUpdate(self, minimalUpdate: bool) -> None:
+        self.minimalUpdate = minimalUpdate
+
+    def set_orderedListDiff(self, orderedListDiff: bool) -> None:
+        self.orderedListDiff = orderedListDiff
+
     def set_skipDeletedEntries(self, skipDeletedEntries: bool) -> None:
         self.skipDeletedEntries = skipDeletedEntries
 
@@ -100,9 +123,18 @@ class CrudOptions:
         self.skip = page * limit
         self.limit = limit
 
+    def set_cursors(self, after: str | None = None, before: str | None = None) -> None:
+        # Opaque cursors returned by Crud.get_page. They replace skip when set
+        self.after = after
+        self.before = before
+
     def set_projection(self, projection: Dict | None = None) -> None:
         self.projection = projection
 
+    def set_projectionFromGQL(self, info: Any, *extraFields: str) -> None:
+        # extraFields: fields not selected by the client but needed by the resolvers
+        self.projection = get_projection_from_info(info, *extraFields)
+
     def set_sort(self, sort: List[Tuple]) -> None:
         self.sort = sort
 
@@ -118,6 +150,8 @@ class CrudOptions:
         skip: int = DEFAULT_SKIP,
         limit: int = DEFAULT_LIMIT,
         page: int = None,
+        after: str | None = None,
+        before: str | None = None,
         filterByUser: bool = False,
         sort: str = "[]",
         projection: Dict | None = None,
@@ -131,6 +165,7 @@ class CrudOptions:
         self.set_dateFilter(dateFilter)
         self.limit = limit
         self.skip = page * limit if page else skip
+        self.set_cursors(after, before)
         self.filterByUser = filterByUser
         self.idsFilter = idsFilter
         self.sort = transform_list_dict_to_list_tuple(json.loads(sort))
@@ -163,3 +198,21 @@ class CrudOptions:
 
     def _is_user_filter_enabled(self) -> bool:
         return self.filterByUser
+
+    def _is_bulk_write_enabled(self) -> bool:
+        return self.bulkWrite
+
+    def _is_concurrency_enabled(self) -> bool:
+        return self.concurrency > DEFAULT_CONCURRENCY
+
+    def _is_upsert_enabled(self) -> bool:
+        return self.upsert
+
+    def _is_minimal_update_enabled(self) -> bool:
+        return self.minimalUpdate
+
+    def _is_ordered_list_diff_enabled(self) -> bool:
+        return self.orderedListDiff
+
+    def _is_keyset_pagination_enabled(self) -> bool:
+        return bool(self.after or self.before)
@@ -1,12 +1,13 @@
 import copy
 from datetime import datetime
-from typing import Any, Dict, List, TypeVar, Union
+from typing import Any, Dict, List, Optional, Tuple, TypeVar, Union
 
 from bson import ObjectId
-from pymongo import MongoClient, ReturnDocument
+from pymongo import InsertOne, MongoClient, ReturnDocument, UpdateOne
 from pymongo.results import InsertOneResult
 
 from _python_core.crud.crud import Crud, ErrorCRUD
+from _python_core.crud.crud_engine import CrudEngine
 from _python_core.crud.crud_constants import (
     ACTIVE,
     CREATE,
@@ -23,6 +24,7 @@ from _python_core.crud.crud_constants import (
 from _python_core.crud.crud_options import CrudOptions
 from _python_core.history import History
 from _python_core.http_codes import HTTPCode
+from _python_core.reference_cache import referenceCache
 from _python_core.translations import Translations as tr
 
 TData = Dict[str, Any]  # Type object as defined in GQL Schema
@@ -34,8 +36,10 @@ TCrudOne = TypeVar("TCrudOne", bound="CrudOne")
 
 
 class CrudOne(Crud):
-    def __init__(self, mongo: MongoClient, lang: str = "en") -> None:
-        super().__init__(mongo, lang)
+    def __init__(
+        self, mongo: MongoClient, lang: str = "en", engine: Optional[CrudEngine] = None
+    ) -> None:
+        super().__init__(mongo, lang, engine)
         self._initialize_values()
 
     def _initialize_values(self) -> None:
@@ -44,11 +48,16 @@ class CrudOne(Crud):
         self.error: str = ""
         self.data: TData = {}
         self.originalData: TData = {}
+        self.action: str = ""
+        self.history: TData = {}
+        self.changes: List[TData] = []
 
     @classmethod
     def copy(cls, crudOne: TCrudOne) -> TCrudOne:
-        newCrud = cls(crudOne.mongoDB)
+        newCrud = cls(crudOne.mongoDB, engine=crudOne.engine)
         newCrud.set_collection(crudOne.collection)
+        newCrud.set_changelog_writer(crudOne.changelogWriter)
+        newCrud.set_identity_map(crudOne.identityMap)
         return newCrud
 
     def set_language(self, lang: str) -> None:
@@ -81,13 +90,20 @@ class CrudOne(Crud):
 
     @request_postprocess
     async def insert_update(self, schema: TData) -> None:
+        self._prepare_insert_update(schema)
+
+        if self.options._is_upsert_enabled():
+            await self._upsert()
+            return
+
+        await self._insert() if await self._is_insert() else await self._update()
+
+    def _prepare_insert_update(self, schema: TData) -> None:
         self.schema = schema
         self._reset_message_errors_and_data()
         self._check_valid_schema()
         self._tweak_entry()
 
-        await self._insert() if await self._is_insert() else await self._update()
-
     def _tweak_entry(self) -> None:
         self._tweak_null_or_empty_id()
         self._tweak_non_null_non_empty_id()
@@ -132,9 +148,12 @@ class CrudOne(Crud):
         return False
 
     def _raise_error(self, msg: str, http_code: HTTPCode = HTTPCode.CODE_400) -> None:
+        self._set_error(msg, http_code)
+        raise ErrorCRUD(self.error)
+
+    def _set_error(self, msg: str, http_code: HTTPCode = HTTPCode.CODE_400) -> None:
         self.error = self.translate(msg)
         self.http_code = http_code
-        raise ErrorCRUD(self.error)
 
     async def _is_insert(self) -> bool:
         await self._retrieve_original_data_if_exists()
@@ -160,12 +179,14 @@ class CrudOne(Crud):
         return bool(self.originalData)
 
     async def _insert(self) -> None:
-        result = self._insert_in_database()
+        result = await self._insert_in_database()
         await self._process_after_insert(result)
 
-    def _insert_in_database(self) -> InsertOneResult:
+    async def _insert_in_database(self) -> InsertOneResult:
         self._add_audit_fields_to_insert()
-        return self.mongo.insert_one(self.schema)
+        result: InsertOneResult = await self.engine.insert_one(self.mongo, self.schema)
+        self._forget_in_identity_map(result.inserted_id)
+        return result
 
     async def _process_after_insert(self, result: InsertOneResult) -> None:
         if result.inserted_id:
@@ -174,8 +195,13 @@ class CrudOne(Crud):
             self._raise_error("ERROR_UNKNOWN_MONGO_INSERT", HTTPCode.CODE_500)
 
     async def _process_after_insert_OK(self, result: InsertOneResult) -> None:
-        self.schema = await self.get_by_id(result.inserted_id)
+        if not self.options._is_upsert_enabled():
+            self.schema = await self.get_by_id(result.inserted_id)
+        await self._process_inserted_data()
+
+    async def _process_inserted_data(self) -> None:
         self.data = copy.deepcopy(self.schema)
+        self._invalidate_reference_cache()
         self.message = self.translate("MSG_SUCCESSFULLY_INSERTED")
         if self._is_update_changelog():
             await self._save_changelog(self.schema, CREATE)
@@ -186,12 +212,15 @@ class CrudOne(Crud):
             self.schema[CREATE_DATE] = datetime.utcnow()
             self._set_deactivate_audit_fields()
 
+    def _invalidate_reference_cache(self) -> None:
+        referenceCache.invalidate(self.collection, self.data.get("_id"))
+
     def _is_update_changelog(self) -> bool:
         return self.options.updateChangeLog
 
     async def _save_changelog(self, entry: TData, action: str = UPDATE) -> None:
         historyClass: History = self._config_changelog(entry, action)
-        await historyClass.calculate(self.mongoDB)
+        await historyClass.calculate(self.mongoDB, self.engine)
         history: TData = historyClass.get()
 
         await self._save_changelog_in_database(history)
@@ -200,15 +229,32 @@ class CrudOne(Crud):
         history: History = History(entry)
         history.set_collection(self.collection)
         history.set_action(action)
+        history.set_ordered_lists(self.options._is_ordered_list_diff_enabled())
         return history
 
+    def _prepare_changelog_documents(self, histories: List[TData]) -> List[TData]:
+        changelog_crud: CrudOne = self._set_changelog_crud(self._set_changelog_crud_options())
+        documents: List[TData] = []
+        for history in histories:
+            changelog_crud.schema = history
+            changelog_crud._tweak_entry()
+            changelog_crud._add_audit_fields_to_insert()
+            documents.append(changelog_crud.schema)
+        return documents
+
     async def _save_changelog_in_database(self, history: TData) -> None:
+        if self.changelogWriter:
+            await self.changelogWriter.put(self._prepare_changelog_documents([history]))
+            return
+
         changelog_crud_options: CrudOptions = self._set_changelog_crud_options()
         changelog_crud: CrudOne = self._set_changelog_crud(changelog_crud_options)
         await changelog_crud.insert_update(history)
 
     def _set_changelog_crud(self, changelog_crud_options: CrudOptions) -> TCrudOne:
-        changelog_crud: CrudOne = CrudOne(self.mongoDB, lang=changelog_crud_options.lang)
+        changelog_crud: CrudOne = CrudOne(
+            self.mongoDB, lang=changelog_crud_options.lang, engine=self.engine
+        )
         changelog_crud.set_collection(History.collection)
         changelog_crud.set_options(changelog_crud_options)
         return changelog_crud
@@ -232,33 +278,170 @@ class CrudOne(Crud):
 
     async def _update_if_there_are_changes_in_schema(self) -> None:
         await self._process_before_update()
-        data: TData = self._update_in_database()
+        data: TData = await self._update_in_database()
         await self._process_after_update(data)
 
     async def _process_before_update(self) -> None:
         if self._is_update_changelog():
-            await self._save_changelog(self.schema, UPDATE)
+            await self._save_changelog_in_database(self.history)
 
-    def _update_in_database(self) -> TData:
+    async def _update_in_database(self) -> TData:
         self._add_audit_fields_to_update()
-        return self.mongo.find_one_and_update(
+        data: TData = await self.engine.find_one_and_update(
+            self.mongo,
             {"_id": ObjectId(self.schema["_id"])},
-            {"$set": self.schema},
+            self._get_update_document(),
             return_document=ReturnDocument.AFTER,
         )
+        self._remember_in_identity_map(self.schema["_id"], data)
+        return data
+
+    def _get_update_document(self) -> Dict[str, TData]:
+        if not self.options._is_minimal_update_enabled():
+            return {"$set": self.schema}
+
+        changedPaths: Optional[Dict[str, List[List[str]]]] = self._get_changed_paths()
+        if changedPaths is None:
+            return {"$set": self.schema}
+
+        update: Dict[str, TData] = {"$set": {}, "$unset": {}}
+        for key, value in self.schema.items():
+            if key in changedPaths:
+                self._add_changed_paths_to_update(update, key, changedPaths[key])
+            elif key != "_id" and (
+                key not in self.originalData or self.originalData[key] != value
+            ):
+                # Audit and omitted fields are not part of the diff
+                update["$set"][key] = value
+        return {operator: fields for operator, fields in update.items() if fields} or {
+            "$set": self.schema
+        }
+
+    def _get_changed_paths(self) -> Optional[Dict[str, List[List[str]]]]:
+        changedPaths: Dict[str, List[List[str]]] = {}
+        for change in self.changes:
+            if not change["field"]:
+                return None
+            path: List[str] = change["field"].split(".")
+            changedPaths.setdefault(path[0], []).append(path)
+        return changedPaths
+
+    def _add_changed_paths_to_update(
+        self, update: Dict[str, TData], key: str, paths: List[List[str]]
+    ) -> None:
+        value: Any = self.schema[key]
+        if (
+            any(len(path) == 1 for path in paths)
+            or not isinstance(value, dict)
+            or not all(_is_path_in_documents(self.originalData, path) for path in paths)
+        ):
+            update["$set"][key] = value
+            return
+
+        # Nested keys skipped by the diff (e.g. "id") would be lost: check the paths rebuild value
+        rebuilt: Any = copy.deepcopy(self.originalData.get(key))
+        fields: Dict[str, TData] = {"$set": {}, "$unset": {}}
+        for path in paths:
+            found, newValue = _get_value_in_path(value, path[1:])
+            rebuilt = _set_value_in_path(rebuilt, path[1:], newValue, found)
+            fields["$set" if found else "$unset"][".".join(path)] = newValue if found else ""
+
+        if rebuilt != value:
+            update["$set"][key] = value
+            return
+        for operator in fields:
+            update[operator] |= fields[operator]
 
     async def _process_after_update(self, data: TData) -> None:
         if data:
             self.data = data
             self.message = self.translate("MSG_SUCCESSFULLY_UPDATED")
+            self._invalidate_reference_cache()
         else:
             self._raise_error("ERROR_UNKNOWN_MONGO_UPDATE", HTTPCode.CODE_500)
 
     async def _there_are_changes(self) -> bool:
         historyClass: History = self._config_changelog(self.schema, UPDATE)
-        await historyClass.calculate(self.mongoDB)
-        history: TData = historyClass.get()
-        return len(history[History.collection]) > 0
+        historyClass.set_original_data(self.originalData)
+        thereAreChanges: bool = await historyClass.has_changes(self.mongoDB, self.engine)
+        if thereAreChanges and self._is_changelog_needed():
+            await historyClass.calculate(self.mongoDB, self.engine)
+        # Kept for the changelog and the update document, so the diff is only computed once
+        self.history = historyClass.get()
+        self.changes = self.history[History.collection]
+        return thereAreChanges
+
+    def _is_changelog_needed(self) -> bool:
+        # The changes are saved in the changelog and give the fields of a minimal update
+        return self._is_update_changelog() or self.options._is_minimal_update_enabled()
+
+    async def _upsert(self) -> None:
+        if not self.schema.get("_id"):
+            await self._insert()
+            return
+
+        # The previous version tells whether the entry was inserted or updated
+        previous: Optional[TData] = await self._upsert_in_database()
+        if previous is None:
+            await self._process_inserted_data()
+        else:
+            await self._process_after_upsert_update(previous)
+
+    async def _upsert_in_database(self) -> Optional[TData]:
+        _id: ObjectId = self.schema["_id"]
+        fields: TData = {key: value for key, value in self.schema.items() if key != "_id"}
+        self._add_audit_fields_to_insert()
+        insertFields: TData = {
+            key: value for key, value in self.schema.items() if key not in fields and key != "_id"
+        }
+        self.schema = {"_id": _id, **fields}
+
+        update: Dict[str, TData] = {"$set": fields} if fields else {}
+        update["$setOnInsert"] = insertFields or {"_id": _id}
+        previous: Optional[TData] = await self.engine.find_one_and_update(
+            self.mongo,
+            {"_id": _id},
+            update,
+            upsert=True,
+            return_document=ReturnDocument.BEFORE,
+        )
+        self._forget_in_identity_map(_id)
+        if previous is None:
+            self.schema |= insertFields
+        return previous
+
+    async def _process_after_upsert_update(self, previous: TData) -> None:
+        self.originalData = previous
+        self._patch()
+        if not await self._there_are_changes():
+            self.data = copy.deepcopy(self.schema)
+            self.message = self.translate("MESSAGE_NO_CHANGES_TO_UPDATE")
+            return
+
+        data: TData = await self._update_audit_fields_in_database()
+        await self._process_after_update(data)
+        if self._is_update_changelog():
+            await self._save_changelog_in_database(self.history)
+
+    async def _update_audit_fields_in_database(self) -> TData:
+        fields: TData = dict(self.schema)
+        self._add_audit_fields_to_update()
+        auditFields: TData = {
+            key: value
+            for key, value in self.schema.items()
+            if key not in fields or fields[key] is not value
+        }
+        if not auditFields:
+            return copy.deepcopy(self.schema)
+
+        data: TData = await self.engine.find_one_and_update(
+            self.mongo,
+            {"_id": self.schema["_id"]},
+            {"$set": auditFields},
+            return_document=ReturnDocument.AFTER,
+        )
+        self._remember_in_identity_map(self.schema["_id"], data)
+        return data
 
     def _add_audit_fields_to_update(self) -> None:
         if self.options.updateAuditFields:
@@ -275,30 +458,84 @@ class CrudOne(Crud):
         elif self.schema.get(ACTIVE) is True and self.schema.get(DEACTIVATE_DATE):
             self.schema[DEACTIVATE_DATE] = None
 
+    async def _plan_bulk_write(
+        self, originals: Dict[ObjectId, TData]
+    ) -> Union[InsertOne, UpdateOne, None]:
+        self.originalData = originals.get(self.schema.get("_id"), {})
+        operation = (
+            await self._plan_bulk_update()
+            if self._is_already_inserted_in_ddbb()
+            else self._plan_bulk_insert()
+        )
+        originals[self.schema["_id"]] = self.schema
+        return operation
+
+    def _plan_bulk_insert(self) -> InsertOne:
+        self.action = CREATE
+        self._add_audit_fields_to_insert()
+        self.schema.setdefault("_id", ObjectId())
+        self.history = self._config_changelog(self.schema, CREATE).get()
+        return InsertOne(self.schema)
+
+    async def _plan_bulk_update(self) -> Optional[UpdateOne]:
+        self.action = UPDATE
+        self._patch()
+        if not await self._there_are_changes():
+            self.history = {}
+            self.data = copy.deepcopy(self.schema)
+            self.message = self.translate("MESSAGE_NO_CHANGES_TO_UPDATE")
+            self.http_code = HTTPCode.CODE_200
+            return None
+
+        self._add_audit_fields_to_update()
+        return UpdateOne({"_id": self.schema["_id"]}, self._get_update_document())
+
+    def _process_after_bulk_write(self) -> None:
+        self.data = copy.deepcopy(self.schema)
+        self._invalidate_reference_cache()
+        self._forget_in_identity_map(self.data["_id"])
+        self.message = self.translate(
+            "MSG_SUCCESSFULLY_INSERTED" if self.action == CREATE else "MSG_SUCCESSFULLY_UPDATED"
+        )
+        self.http_code = HTTPCode.CODE_200
+
+    def _process_after_bulk_write_error(self) -> None:
+        self.history = {}
+        self.error = self.translate(
+            "ERROR_UNKNOWN_MONGO_INSERT" if self.action == CREATE else "ERROR_UNKNOWN_MONGO_UPDATE"
+        )
+        self.http_code = HTTPCode.CODE_500
+
     @request_postprocess
     async def delete(self, id: str) -> None:
-        self.schema = {"_id": id}
-        self._reset_message_errors_and_data()
-        self._check_valid_id_for_delete()
+        self._prepare_delete(id)
         await self._check_existing_data(id)
 
         await self._soft_delete() if self._is_soft_delete() else await self._hard_delete()
 
+    def _prepare_delete(self, id: str) -> None:
+        self.schema = {"_id": id}
+        self._reset_message_errors_and_data()
+        self._check_valid_id_for_delete()
+
     def _check_valid_id_for_delete(self) -> None:
         if not self._is_id_valid():
             self._raise_error("ERROR_INVALID_ID", HTTPCode.CODE_400)
 
     async def _soft_delete(self) -> None:
-        data = self._soft_delete_in_database()
+        data = await self._soft_delete_in_database()
         await self._process_after_delete(data)
 
-    def _soft_delete_in_database(self) -> TData:
+    async def _soft_delete_in_database(self) -> TData:
         self._add_audit_fields_to_delete()
-        return self.mongo.find_one_and_update(
+        data: TData = await self.engine.find_one_and_update(
+            self.mongo,
             {"_id": ObjectId(self.schema["_id"])},
             {"$set": self.schema},
             return_document=ReturnDocument.AFTER,
         )
+        self._remember_in_identity_map(self.schema["_id"], data)
+        return data
 
     async def _process_after_delete(self, data: TData) -> None:
         if data:
@@ -307,35 +544,72 @@ class CrudOne(Crud):
             self._process_after_delete_Error()
 
     def _process_after_delete_Error(self) -> None:
-        msg_error: str = (
+        self._raise_error(self._get_delete_error_message(), HTTPCode.CODE_500)
+
+    def _get_delete_error_message(self) -> str:
+        return (
             "ERROR_UNKNOWN_MONGO_SOFT_DELETE"
             if self._is_soft_delete()
             else "ERROR_UNKNOWN_MONGO_HARD_DELETE"
         )
-        self._raise_error(msg_error, HTTPCode.CODE_500)
 
     async def _process_after_delete_OK(self, data: TData) -> None:
         self.data = data
-        msg_changelog: str = (
+        self._invalidate_reference_cache()
+        self.message = self.translate(self._get_delete_message())
+        if self._is_update_changelog():
+            await self._save_changelog(data, DELETE)
+
+    def _get_delete_message(self) -> str:
+        return (
             "MSG_SUCCESSFULLY_SOFT_DELETED"
             if self._is_soft_delete()
             else "MSG_SUCCESSFULLY_HARD_DELETED"
         )
-        self.message = self.translate(msg_changelog)
-        if self._is_update_changelog():
-            await self._save_changelog(data, DELETE)
 
     def _add_audit_fields_to_delete(self) -> None:
-        if self.options.updateAuditFields:
-            self.schema[DELETED_USER] = {"id": self.options.userId}
-            self.schema[DELETED_DATE] = datetime.utcnow()
+        self.schema |= self._get_audit_fields_to_delete()
+
+    def _get_audit_fields_to_delete(self) -> TData:
+        if not self.options.updateAuditFields:
+            return {}
+        return {DELETED_USER: {"id": self.options.userId}, DELETED_DATE: datetime.utcnow()}
+
+    def _plan_bulk_delete(self, originals: Dict[ObjectId, TData], auditFields: TData) -> bool:
+        _id: ObjectId = ObjectId(self.schema["_id"])
+        # A hard deleted entry can only be deleted once, even if its id is repeated
+        original: Optional[TData] = (
+            originals.get(_id) if self._is_soft_delete() else originals.pop(_id, None)
+        )
+        if not original:
+            self.schema = {}
+            self._set_error("ERROR_UNEXISTING_DATA")
+            return False
+
+        self.schema = {**original, **auditFields}
+        return True
+
+    def _process_after_bulk_delete(self) -> None:
+        self.data = copy.deepcopy(self.schema)
+        self._invalidate_reference_cache()
+        self._forget_in_identity_map(self.data["_id"])
+        self.message = self.translate(self._get_delete_message())
+        self.http_code = HTTPCode.CODE_200
+        self.history = self._config_changelog(self.data, DELETE).get()
+
+    def _process_after_bulk_delete_error(self) -> None:
+        self._set_error(self._get_delete_error_message(), HTTPCode.CODE_500)
 
     async def _hard_delete(self) -> None:
-        data = self._hard_delete_in_database()
+        data = await self._hard_delete_in_database()
         await self._process_after_delete(data)
 
-    def _hard_delete_in_database(self) -> TData:
-        return self.mongo.find_one_and_delete({"_id": ObjectId(self.schema["_id"])})
+    async def _hard_delete_in_database(self) -> TData:
+        data: TData = await self.engine.find_one_and_delete(
+            self.mongo, {"_id": ObjectId(self.schema["_id"])}
+        )
+        self._remember_in_identity_map(self.schema["_id"], None)
+        return data
 
     def _is_soft_delete(self) -> bool:
         return self.options.softDelete
@@ -380,3 +654,38 @@ class CrudOne(Crud):
 
     def get_http_code(self) -> HTTPCode:
         return self.http_code
+
+
+def _get_value_in_path(entry: Any, path: List[str]) -> Tuple[bool, Any]:
+    for key in path:
+        if not isinstance(entry, dict) or key not in entry:
+            return False, None
+        entry = entry[key]
+    return True, entry
+
+
+def _is_path_in_documents(entry: TData, path: List[str]) -> bool:
+    # Mongo only creates fields inside documents: a string, array or null parent rejects them
+    for key in path[:-1]:
+        if key not in entry:
+            return True
+        entry = entry[key]
+        if not isinstance(entry, dict):
+            return False
+    return True
+
+
+def _set_value_in_path(entry: Any, path: List[str], value: Any, found: bool = True) -> Any:
+    """Applies a $set (or an $unset when not found) of path over entry, as Mongo would"""
+    if not path:
+        return value
+    entry = entry if isinstance(entry, dict) else {}
+    if len(path) == 1:
+        if found:
+            entry[path[0]] = value
+        else:
+            entry.pop(path[0], None)
+        return entry
+    if found or path[0] in entry:
+        entry[path[0]] = _set_value_in_path(entry.get(path[0]), path[1:], value, found)
+    return entry
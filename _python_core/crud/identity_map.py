@@ -0,0 +1,34 @@
+import copy
+from typing import Any, Dict, Optional, Tuple
+
+TData = Dict[str, Any]  # Type object as defined in GQL Schema
+TIdentityKey = Tuple[str, str]
+
+
+class IdentityMap:
+    """Documents read by _id during one request, keyed by (collection, _id).
+
+    Crud.get_by_id reads each document at most once while the map is set, and CrudOne keeps
+    it up to date with its own writes. Every caller gets its own copy of the document.
+    """
+
+    contextKey: str = "identityMap"
+
+    def __init__(self) -> None:
+        self.entries: Dict[TIdentityKey, Optional[TData]] = {}
+
+    @classmethod
+    def for_context(cls, context: Any) -> "IdentityMap":
+        return context.setdefault(cls.contextKey, cls())
+
+    def contains(self, collection: str, id: Any) -> bool:
+        return (collection, str(id)) in self.entries
+
+    def get(self, collection: str, id: Any) -> Optional[TData]:
+        return copy.deepcopy(self.entries.get((collection, str(id))))
+
+    def set(self, collection: str, id: Any, document: Optional[TData]) -> None:
+        self.entries[(collection, str(id))] = copy.deepcopy(document)
+
+    def invalidate(self, collection: str, id: Any) -> None:
+        self.entries.pop((collection, str(id)), None)
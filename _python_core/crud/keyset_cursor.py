@@ -0,0 +1,63 @@
+import base64
+import binascii
+from typing import Any, Dict, List, Tuple
+
+from bson import json_util
+
+TData = Dict[str, Any]  # Type object as defined in GQL Schema
+
+
+def get_keyset_sort(sort: List[Tuple]) -> List[Tuple]:
+    # _id breaks the ties, so every entry has a unique position in the sort
+    if any(key == "_id" for key, _ in sort):
+        return list(sort)
+    return list(sort) + [("_id", sort[-1][1] if sort else 1)]
+
+
+def get_keyset_projection(projection: Dict, sort: List[Tuple]) -> Dict:
+    # The cursors need the sort keys. Mongo rejects a path next to its parent, so keep one
+    projection = dict(projection)
+    for key, _ in sort:
+        if any(projection[field] and _is_in_path(key, field) for field in projection):
+            continue
+        for field in [field for field in projection if _is_in_path(field, key)]:
+            del projection[field]
+        projection[key] = 1
+    return projection
+
+
+def encode_cursor(entry: TData, sort: List[Tuple]) -> str:
+    values: List[Any] = [_get_value(entry, key) for key, _ in sort]
+    return base64.urlsafe_b64encode(json_util.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str, sort: List[Tuple]) -> List[Any]:
+    try:
+        values: Any = json_util.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError, UnicodeError):
+        raise ValueError(cursor)
+    if not isinstance(values, list) or len(values) != len(sort):
+        raise ValueError(cursor)
+    return values
+
+
+def get_keyset_filter(sort: List[Tuple], values: List[Any], backwards: bool = False) -> Dict:
+    # Entries after the cursor: (k1 > v1) or (k1 == v1 and k2 > v2) or ...
+    conditions: List[Dict] = []
+    for index, (key, direction) in enumerate(sort):
+        operator: str = "$gt" if (direction > 0) != backwards else "$lt"
+        condition: Dict = {sort[i][0]: values[i] for i in range(index)}
+        condition[key] = {operator: values[index]}
+        conditions.append(condition)
+    return {"$or": conditions}
+
+
+def _is_in_path(key: str, path: str) -> bool:
+    return key == path or key.startswith(path + ".")
+
+
+def _get_value(entry: TData, key: str) -> Any:
+    value: Any = entry
+    for field in key.split("."):
+        value = value.get(field) if isinstance(value, dict) else None
+    return value
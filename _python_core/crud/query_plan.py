@@ -0,0 +1,47 @@
+import copy
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+TData = Dict[str, Any]  # Type object as defined in GQL Schema
+
+
+class QueryPlan(NamedTuple):
+    """Filter, sort, projection, skip and limit derived from one CrudOptions state.
+
+    Crud builds it once and reuses it while the options do not change. The plan keeps its own
+    deep copy of the options, and every query gets a deep copy of its filter and projection,
+    so changing them never changes the cached plan.
+    """
+
+    defaultFilter: Mapping[str, Any]
+    sort: Tuple[Tuple, ...]
+    projection: Optional[Mapping[str, Any]]
+    skip: int
+    limit: int
+
+    @classmethod
+    def build(
+        cls,
+        defaultFilter: Dict,
+        sort: List[Tuple],
+        projection: Optional[Dict],
+        skip: int,
+        limit: int,
+    ) -> "QueryPlan":
+        return cls(
+            MappingProxyType(copy.deepcopy(defaultFilter)),
+            tuple(tuple(item) for item in sort),
+            MappingProxyType(copy.deepcopy(projection)) if projection is not None else None,
+            skip,
+            limit,
+        )
+
+    def get_filter(self, filter: Dict) -> Dict:
+        # The default filters win, as they did when they were written over the filter
+        return {**filter, **copy.deepcopy(dict(self.defaultFilter))}
+
+    def get_sort(self) -> List[Tuple]:
+        return list(self.sort)
+
+    def get_projection(self) -> Optional[Dict]:
+        return copy.deepcopy(dict(self.projection)) if self.projection is not None else None
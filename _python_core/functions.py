@@ -1,6 +1,6 @@
 import hashlib
 import re
-from typing import Any, Dict, List, Tuple, Union
+from typing import Any, Dict, Hashable, List, Optional, Set, Tuple, Union
 
 from bson import ObjectId
 from _python_core.constants import ID, _ID
@@ -86,6 +86,22 @@ def contains_all_fields(schema: Dict, fields: List[str]) -> bool:
     return all(field in schema for field in fields)
 
 
+def freeze(value: Any) -> Hashable:
+    """Hashable representation of a value. Values that compare equal get equal keys"""
+    if isinstance(value, dict):
+        return (dict, frozenset((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(freeze(item) for item in value))
+    if isinstance(value, (set, frozenset)):
+        return (set, frozenset(freeze(item) for item in value))
+    try:
+        hash(value)
+    except TypeError:
+        # Decimal128, Regex, Code... compare equal when their repr is equal
+        return (type(value), repr(value))
+    return value
+
+
 def transform_list_dict_to_list_tuple(dict: List[Dict]) -> List[tuple]:
     tupleRes: List[Tuple] = []
     if len(dict):
@@ -96,3 +112,28 @@ def transform_list_dict_to_list_tuple(dict: List[Dict]) -> List[tuple]:
         tupleVals = tuple([keys[0], tupleList[0]])
         tupleRes = [tupleVals]
     return tupleRes
+
+
+def get_projection_from_info(info: Any, *extraFields: str) -> Optional[Dict[str, int]]:
+    """Mongo projection with the fields selected in a GraphQLResolveInfo (first level only)"""
+    fields: Set[str] = set()
+    for fieldNode in info.field_nodes:
+        fields |= _get_selected_fields(fieldNode.selection_set, info.fragments)
+    fields.discard("__typename")
+    if not fields:
+        return None
+    return {field: 1 for field in sorted(fields | set(extraFields))}
+
+
+def _get_selected_fields(selectionSet: Any, fragments: Dict[str, Any]) -> Set[str]:
+    fields: Set[str] = set()
+    for selection in selectionSet.selections if selectionSet else []:
+        if selection.kind == "fragment_spread":
+            fields |= _get_selected_fields(
+                fragments[selection.name.value].selection_set, fragments
+            )
+        elif selection.kind == "inline_fragment":
+            fields |= _get_selected_fields(selection.selection_set, fragments)
+        else:
+            fields.add(selection.name.value)
+    return fields
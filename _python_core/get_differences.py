@@ -1,11 +1,41 @@
-import copy
-from typing import Any, Dict, List, Optional
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Hashable, Iterator, List, Optional, Tuple
+
+from bson import ObjectId
 
 import _python_core.functions as fn
 from _python_core import Errors as err
 from _python_core.translations import Translations as tr
 
 Object = Dict[str, Any]
+TPath = Tuple[Any, ...]
+TChange = Tuple[TPath, Any, Any]
+TEdit = Tuple[str, Optional[int], Optional[int]]  # Operation, index in the old and the new list
+
+OMIT_FIELDS: FrozenSet[str] = frozenset(
+    [
+        "_id",
+        "id",
+        "createUserId",
+        "createUser",
+        "createDate",
+        "modifiedUserId",
+        "modifiedUser",
+        "modifiedDate",
+        "deletedUserId",
+        "deletedUser",
+        "deletedDate",
+    ]
+)
+
+_SCALAR_TYPES = frozenset([str, int, float, bool, datetime, ObjectId])
+_ABSENT = object()  # Field missing on one side: None in the changelog instead of "None"
+
+INSERT = "insert"
+DELETE = "delete"
+REPLACE = "replace"
+ORDERED_LISTS_MAX_EDITS: int = 100  # Longer edit scripts are saved as a whole list change
 
 
 class ExceptionDifferentTypes(err.ErrorBase):
@@ -15,153 +45,228 @@ class ExceptionDifferentTypes(err.ErrorBase):
 
 
 class GetDifferences:
-    def __init__(self, lang: str = "en", *omit_fields: Any) -> None:
+    __slots__ = ("changeLog", "lanf", "possibleErrorField", "orderedLists", "_OMIT_FIELDS")
+
+    def __init__(self, lang: str = "en", *omit_fields: Any, orderedLists: bool = False) -> None:
         self.changeLog: List = []
         self.lanf: str = lang
         self.possibleErrorField: str = ""
-        self._OMIT_FIELDS = [
-            "_id",
-            "id",
-            "createUserId",
-            "createUser",
-            "createDate",
-            "modifiedUserId",
-            "modifiedUser",
-            "modifiedDate",
-            "deletedUserId",
-            "deletedUser",
-            "deletedDate",
-        ]
-        self._OMIT_FIELDS.extend(omit_fields)
+        self.orderedLists: bool = orderedLists
+        self._OMIT_FIELDS: FrozenSet = OMIT_FIELDS.union(omit_fields)
 
     def get_differences(self) -> List:
         return self.changeLog
 
     def calculate(self, newItem: Any, oldItem: Any) -> None:
-        self.__reset()
-        self.__get_differences(newItem, oldItem)
+        self.changeLog = [
+            {"field": _get_field(path), "oldValue": _to_str(old), "newValue": _to_str(new)}
+            for path, old, new in self.__get_differences(newItem, oldItem)
+        ]
 
-    def __reset(self) -> None:
+    def has_differences(self, newItem: Any, oldItem: Any) -> bool:
+        """Stops at the first difference, without building any changelog entry"""
         self.changeLog = []
+        return next(self.__get_differences(newItem, oldItem), None) is not None
 
-    def __get_differences(self, item1: Any, item2: Any, path_key: Optional[str] = None) -> None:
-        # sourcery no-metrics skip: remove-pass-elif
-        """Gets differences"""
+    def __get_differences(self, newItem: Any, oldItem: Any) -> Iterator[TChange]:
+        # Depth first with an explicit stack. Paths are tuples, joined only for the changelog
+        stack: List[Tuple[Any, Any, TPath]] = [(newItem, oldItem, ())]
+        while stack:
+            item1, item2, path = stack.pop()
+            if item1 is None or item2 is None:
+                if not are_equal(item1, item2):
+                    yield path, item2, item1
 
-        if item1 is None or item2 is None:
-            self.__get_differencesNoContainer(item1, item2, path_key)
+            elif isinstance(item1, dict):
+                children: List[Tuple[Any, Any, TPath]] = []
+                yield from self.__get_differencesDict(item1, item2, path, children)
+                stack.extend(reversed(children))
 
-        # Dict
-        elif isinstance(item1, dict):
-            self.__get_differencesDict(item1, item2, path_key)
+            elif isinstance(item2, list):
+                if self.orderedLists and isinstance(item1, list):
+                    children = []
+                    yield from self.__get_differencesOrdered(item1, item2, path, children)
+                    stack.extend(reversed(children))
+                    continue
 
-        # List
-        elif isinstance(item2, list):
-            item1_diff = self.__get_differencesList(item1, item2)
-            item2_diff = self.__get_differencesList(item2, item1)
-            self.__setChangeLogForLists(item1_diff, item2_diff, path_key)
+                item1_diff, item2_diff = self.__get_differencesLists(item1, item2)
+                if item1_diff or item2_diff:
+                    yield path, item2_diff, item1_diff
 
-        # Set
-        elif isinstance(item1, set):
-            # Not implemente yet
-            pass
+            elif isinstance(item1, set):
+                # Not implemented yet
+                continue
 
-        # String, Bool, Int, Float
-        else:
-            self.__get_differencesNoContainer(item1, item2, path_key)
+            # String, Bool, Int, Float
+            elif not are_equal(item1, item2):
+                yield path, item2, item1
 
     def __get_differencesDict(
-        self, item1: Object, item2: Object, path_key: Optional[str] = None
-    ) -> None:
-        # sourcery no-metrics
-        """Gets differences between dictionaries"""
-        old_key: Optional[str] = ""
-        # Case Intersection
-        path_key = self._get_differencesDictForIntersection(item1, item2, path_key)
-
-        # Case Difference
-        # Be carefull, this logic is meant to determine ONLY if new fields are added to item2
-        new_elements = set(item1).difference((set(item2)))
-        for key in new_elements:
-            old_key = path_key
-            if key in self._OMIT_FIELDS:
-                continue
-            path_key = key if path_key is None else f"{path_key}.{key}"
-            self.changeLog.append(
-                {
-                    "field": path_key,
-                    "oldValue": None,
-                    "newValue": str(item1[key]),
-                }
-            )
-            path_key = old_key
-
-        old_elements = set(item2).difference((set(item1)))
-        for key in old_elements:
-            old_key = path_key
-            if key in self._OMIT_FIELDS and not path_key:
-                continue
-            path_key = key if path_key is None else f"{path_key}.{key}"
-            self.changeLog.append(
-                {
-                    "field": path_key,
-                    "oldValue": str(item2[key]),
-                    "newValue": None,
-                }
-            )
-            path_key = old_key
-
-    def _get_differencesDictForIntersection(
-        self, item1: Dict, item2: Dict, path_key: Optional[str]
-    ) -> Optional[str]:  # sourcery no-metrics
-        common_elements = set(item1).intersection(item2)
-        for key in common_elements:
-            old_key = path_key
-            if key in self._OMIT_FIELDS and not path_key:
-                continue
-            path_key = key if path_key is None else f"{path_key}.{key}"
-            self.possibleErrorField = key
-            self.__get_differences(item1[key], item2[key], path_key=path_key)
-            path_key = old_key
-        return path_key
-
-    def __get_differencesList(self, item1: List[Any], item2: List[Any]) -> List:
-        # sourcery no-metrics
-        """Gets differences between Lists or Sets"""
-
-        diff_item1: List = copy.deepcopy(item1)
-        item2_copy: List = copy.deepcopy(item2)
-        for elm in item1:
-            if elm in self._OMIT_FIELDS:
-                diff_item1.pop(diff_item1.index(elm))
+        self, item1: Object, item2: Any, path: TPath, children: List[Tuple[Any, Any, TPath]]
+    ) -> Iterator[TChange]:
+        # Omitted fields are skipped at any level when added, only at the first level otherwise
+        omitted: FrozenSet = self._OMIT_FIELDS
+        firstLevel: bool = _is_first_level(path)
+        keys2: Any = item2 if isinstance(item2, dict) else set(item2)
+        for key in item1:
+            if key not in keys2:
+                if key not in omitted:
+                    yield path + (key,), _ABSENT, item1[key]
+            elif not (firstLevel and key in omitted):
+                self.possibleErrorField = key
+                children.append((item1[key], item2[key], path + (key,)))
+
+        for key in keys2:
+            if key not in item1 and not (firstLevel and key in omitted):
+                yield path + (key,), item2[key], _ABSENT
+
+    def __get_differencesLists(self, item1: List[Any], item2: List[Any]) -> Tuple[List, List]:
+        """Elements only in item1 and only in item2. Repeated elements are matched one by one"""
+        keys1: List[Hashable] = [fn.freeze(elm) for elm in item1]
+        keys2: List[Hashable] = [fn.freeze(elm) for elm in item2]
+        return (
+            self.__get_differencesList(item1, keys1, Counter(keys2)),
+            self.__get_differencesList(item2, keys2, Counter(keys1)),
+        )
+
+    def __get_differencesList(
+        self, items: List[Any], keys: List[Hashable], other: Counter
+    ) -> List:
+        # Frozen keys of containers never match an omitted field name, as the elements did not
+        omitted: FrozenSet = self._OMIT_FIELDS
+        diff_items: List = []
+        for elm, key in zip(items, keys):
+            if key in omitted:
                 continue
+            if other[key] > 0:
+                other[key] -= 1
+            else:
+                diff_items.append(elm)
+        return diff_items
+
+    def __get_differencesOrdered(
+        self,
+        item1: List[Any],
+        item2: List[Any],
+        path: TPath,
+        children: List[Tuple[Any, Any, TPath]],
+    ) -> Iterator[TChange]:
+        edits: Optional[List[TEdit]] = get_list_edits(
+            [fn.freeze(elm) for elm in item2], [fn.freeze(elm) for elm in item1]
+        )
+        if edits is None:
+            # Too many edits, and maybe only a new order: the whole list is the change
+            yield path, item2, item1
+            return
+
+        # Deleted elements keep their index in item2, inserted and replaced ones take it from item1
+        for operation, oldIndex, newIndex in edits:
+            if operation == DELETE:
+                yield path + (str(oldIndex),), item2[oldIndex], _ABSENT
+            elif operation == INSERT:
+                yield path + (str(newIndex),), _ABSENT, item1[newIndex]
+            elif isinstance(item1[newIndex], dict) and isinstance(item2[oldIndex], dict):
+                children.append((item1[newIndex], item2[oldIndex], path + (str(newIndex),)))
+            else:
+                yield path + (str(newIndex),), item2[oldIndex], item1[newIndex]
+
+
+def get_list_edits(
+    old: List[Hashable], new: List[Hashable], maxEdits: int = ORDERED_LISTS_MAX_EDITS
+) -> Optional[List[TEdit]]:
+    """Shortest edit script from old to new (Myers), None when it needs more than maxEdits"""
+    start: int = 0
+    while start < len(old) and start < len(new) and old[start] == new[start]:
+        start += 1
+    end1, end2 = len(old), len(new)
+    while end1 > start and end2 > start and old[end1 - 1] == new[end2 - 1]:
+        end1, end2 = end1 - 1, end2 - 1
+
+    a, b = old[start:end1], new[start:end2]
+    trace: Optional[List[Dict[int, int]]] = _get_myers_trace(a, b, maxEdits)
+    if trace is None:
+        return None
+    return _get_hunks_edits(_get_myers_steps(trace, len(a), len(b)), start)
+
+
+def _get_myers_trace(a: List[Hashable], b: List[Hashable], maxEdits: int) -> Optional[List]:
+    # Furthest x reached on each diagonal k = x - y, saved before every new edit
+    v: Dict[int, int] = {1: 0}
+    trace: List[Dict[int, int]] = []
+    for d in range(min(len(a) + len(b), maxEdits) + 1):
+        trace.append(v.copy())
+        for k in range(-d, d + 1, 2):
+            x: int = v[k + 1] if k == -d or (k != d and v[k - 1] < v[k + 1]) else v[k - 1] + 1
+            y: int = x - k
+            while x < len(a) and y < len(b) and a[x] == b[y]:
+                x, y = x + 1, y + 1
+            v[k] = x
+            if x >= len(a) and y >= len(b):
+                return trace
+    return None
+
+
+def _get_myers_steps(trace: List[Dict[int, int]], x: int, y: int) -> List[TEdit]:
+    # Walks the trace back from the end: "=" for common elements, DELETE and INSERT otherwise
+    steps: List[TEdit] = []
+    for d in range(len(trace) - 1, -1, -1):
+        v: Dict[int, int] = trace[d]
+        k: int = x - y
+        prevK: int = k + 1 if k == -d or (k != d and v[k - 1] < v[k + 1]) else k - 1
+        prevX: int = v[prevK]
+        prevY: int = prevX - prevK
+        while x > prevX and y > prevY:
+            x, y = x - 1, y - 1
+            steps.append(("=", x, y))
+        if d > 0:
+            steps.append((INSERT, None, prevY) if x == prevX else (DELETE, prevX, None))
+        x, y = prevX, prevY
+    steps.reverse()
+    return steps
+
+
+def _get_hunks_edits(steps: List[TEdit], offset: int) -> List[TEdit]:
+    # Deletions and insertions between the same common elements are paired as replacements
+    edits: List[TEdit] = []
+    deleted: List[int] = []
+    inserted: List[int] = []
+    for operation, oldIndex, newIndex in steps + [("=", None, None)]:
+        if operation == DELETE:
+            deleted.append(oldIndex + offset)
+        elif operation == INSERT:
+            inserted.append(newIndex + offset)
+        elif deleted or inserted:
+            edits.extend((REPLACE, i, j) for i, j in zip(deleted, inserted))
+            edits.extend((DELETE, i, None) for i in deleted[len(inserted) :])
+            edits.extend((INSERT, None, j) for j in inserted[len(deleted) :])
+            deleted, inserted = [], []
+    return edits
+
+
+def _is_first_level(path: TPath) -> bool:
+    # Same as an empty changelog field: the root, or a first level key that is falsy
+    return not path or (len(path) == 1 and not path[0])
+
+
+def _get_field(path: TPath) -> Any:
+    if not path:
+        return None
+    if len(path) == 1:
+        return path[0]
+    return ".".join(map(str, path))
+
+
+def _to_str(value: Any) -> Optional[str]:
+    return None if value is _ABSENT else str(value)
+
 
-            # elm in ITEM2: same? different?
-            if elm in item2:
-                diff_item1.pop(diff_item1.index(elm))
-                item2_copy.pop(item2_copy.index(elm))
-
-        return diff_item1
-
-    def __setChangeLogForLists(self, item1: Any, item2: Any, path_key: Optional[str] = "") -> None:
-        if bool(item1) or bool(item2):
-            self.changeLog.append(
-                {
-                    "field": path_key,
-                    "oldValue": str(item2),
-                    "newValue": str(item1),
-                }
-            )
-
-    def __get_differencesNoContainer(self, item1: Any, item2: Any, name: Optional[str]) -> None:
-        if fn.getHash(item1) != fn.getHash(item2):
-            self.changeLog.append(
-                {
-                    "field": name,
-                    "oldValue": str(item2),
-                    "newValue": str(item1),
-                }
-            )
+def are_equal(item1: Any, item2: Any) -> bool:
+    # Scalars of the same type compare with ==, anything else by its changelog string
+    if item1 is item2:
+        return True
+    if type(item1) is type(item2) and type(item1) in _SCALAR_TYPES:
+        return item1 == item2
+    return str(item1) == str(item2)
 
 
 def translate(msg: str, lang: str = "en") -> str:
@@ -4,6 +4,7 @@ from bson import ObjectId
 from pymongo.collection import Collection
 from pymongo.database import Database
 
+from _python_core.crud.crud_engine import CrudEngine, PymongoEngine
 from _python_core.get_differences import GetDifferences
 
 UPDATE = "Update"
@@ -39,6 +40,8 @@ class History:
             "projectId": "",
         }
         self.omitFields: List[str] = OMIT_FIELDS
+        self.originalData: Optional[TData] = None
+        self.orderedLists: bool = False
 
     def set_collection(self, collection: str) -> None:
         self.history["collection"] = collection
@@ -47,13 +50,36 @@ class History:
         self.action = action
         self.history["action"] = action
 
+    def set_original_data(self, originalData: Optional[TData]) -> None:
+        # Previous version of the entry. When provided, it is not read again from Mongo
+        self.originalData = originalData
+
+    def set_ordered_lists(self, orderedLists: bool) -> None:
+        # Lists changes by index instead of the elements added and removed from the whole list
+        self.orderedLists = orderedLists
+
     def get(self) -> TData:
         return self.history
 
-    async def calculate(self, mongoDB: Database) -> None:
-        self.mongo: Collection = mongoDB[self.history["collection"]]
+    async def calculate(self, mongoDB: Database, engine: Optional[CrudEngine] = None) -> None:
+        self._set_database(mongoDB, engine)
         await self._set_history_for_update()
 
+    async def has_changes(self, mongoDB: Database, engine: Optional[CrudEngine] = None) -> bool:
+        # Stops at the first change: use calculate when the changelog itself is needed
+        self._set_database(mongoDB, engine)
+        if not self._is_update_entry():
+            return False
+        diffs: GetDifferences = self._get_differences()
+        return diffs.has_differences(self.entry, await self._get_old_entry())
+
+    def _get_differences(self) -> GetDifferences:
+        return GetDifferences(self.lang, *self.omitFields, orderedLists=self.orderedLists)
+
+    def _set_database(self, mongoDB: Database, engine: Optional[CrudEngine]) -> None:
+        self.mongo: Collection = mongoDB[self.history["collection"]]
+        self.engine: CrudEngine = engine or PymongoEngine()
+
     async def _set_history_for_update(self) -> None:
         if self._is_update_entry():
             self.history["changeLog"] = await self._get_history()
@@ -62,10 +88,16 @@ class History:
         return self.action == UPDATE
 
     async def _get_history(self) -> List[THistory]:
-        old_entry: Optional[TData] = self.mongo.find_one({"_id": ObjectId(self.parentID)})
-        diffs: GetDifferences = GetDifferences(self.lang, *self.omitFields)
-        diffs.calculate(self.entry, old_entry)
+        diffs: GetDifferences = self._get_differences()
+        diffs.calculate(self.entry, await self._get_old_entry())
         return diffs.get_differences()
 
+    async def _get_old_entry(self) -> Optional[TData]:
+        if self.originalData is None:
+            self.originalData = await self.engine.find_one(
+                self.mongo, {"_id": ObjectId(self.parentID)}
+            )
+        return self.originalData
+
     def _get_parent_id(self) -> str:
         return str(self.entry.get("_id"))
@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+import bson
+
+TData = Dict[str, Any]  # Type object as defined in GQL Schema
+TCacheKey = Tuple[str, str]
+
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL = 60.0  # seconds
+
+
+class ReferenceCache:
+    """Process-wide LRU cache, with TTL, of the documents loaded by AriadneDataLoader.
+
+    Only the collections enabled with enable() are cached. Every CrudOne write invalidates its
+    entry in this process. Writes done by other processes are seen once the TTL expires.
+    Entries are shared between requests, so only enable collections whose references do not
+    depend on per-request filters (additionalFilter, filterByUser...).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl: float = DEFAULT_TTL,
+    ) -> None:
+        self.max_entries: int = max_entries
+        self.max_bytes: int = max_bytes
+        self.ttl: float = ttl
+        self.collections: Dict[str, float] = {}
+
+        # Documents are kept BSON encoded: every reader decodes its own copy
+        self._entries: OrderedDict[TCacheKey, Tuple[float, bytes]] = OrderedDict()
+        self._bytes: int = 0
+        self._lock = threading.Lock()
+        self._hits: int = 0
+        self._misses: int = 0
+        self._evictions: int = 0
+
+    def enable(self, collection: str, ttl: Optional[float] = None) -> None:
+        self.collections[collection] = self.ttl if ttl is None else ttl
+
+    def disable(self, collection: str) -> None:
+        self.collections.pop(collection, None)
+        self.invalidate(collection)
+
+    def is_enabled(self, collection: str) -> bool:
+        return collection in self.collections
+
+    def get(self, collection: str, id: Any) -> Optional[TData]:
+        key: TCacheKey = (collection, str(id))
+        with self._lock:
+            entry: Optional[Tuple[float, bytes]] = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return bson.decode(entry[1])
+            if entry:
+                self._remove(key)
+            self._misses += 1
+            return None
+
+    def set(self, collection: str, id: Any, document: TData) -> None:
+        if not self.is_enabled(collection):
+            return
+        data: bytes = bson.encode(document)
+        if len(data) > self.max_bytes:
+            return
+
+        key: TCacheKey = (collection, str(id))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.collections[collection], data)
+            self._bytes += len(data)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def invalidate(self, collection: str, id: Any = None) -> None:
+        with self._lock:
+            keys: Set[TCacheKey] = (
+                {(collection, str(id))}
+                if id is not None
+                else {key for key in self._entries if key[0] == collection}
+            )
+            for key in keys & self._entries.keys():
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_metrics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+    def _remove(self, key: TCacheKey) -> None:
+        self._bytes -= len(self._entries.pop(key)[1])
+
+
+referenceCache: ReferenceCache = ReferenceCache()
@@ -31,6 +31,7 @@ sentences: Dict = {
         "ERROR_LIMIT_TOO_LOW": "The limit set to get_with_limit is too low. Limit:{}",
         "ERROR_EMPTY_SCHEMA": "Data is empty.",
         "ERROR_INVALID_ID": "The entry has an invalid ID.{}",
+        "ERROR_INVALID_CURSOR": "The pagination cursor is not valid.{}",
         "ERROR_UNKNOWN_MONGO_INSERT": "Something went wrong when inserting the entry in Mongo.{}",
         "ERROR_UNKNOWN_MONGO_UPDATE": "Something went wrong when editing the entry in Mongo.{}",
         "ERROR_UNKNOWN_MONGO_SOFT_DELETE": "Something went wrong when soft deleting the entry in Mongo.{}",
@@ -73,6 +74,7 @@ sentences: Dict = {
         "ERROR_LIMIT_TOO_LOW": "El límite para la función get_with_limit es demasiado pequeño. Límite:{}",
         "ERROR_EMPTY_SCHEMA": "Los datos están vacíos.",
         "ERROR_INVALID_ID": "La entrada tiene un ID inválido.{}",
+        "ERROR_INVALID_CURSOR": "El cursor de paginación no es válido.{}",
         "ERROR_UNKNOWN_MONGO_INSERT": "Error inesperado al insertar la entrada en Mongo.{}",
         "ERROR_UNKNOWN_MONGO_UPDATE": "Error inesperado al editar la entrada en Mongo.{}",
         "ERROR_UNKNOWN_MONGO_SOFT_DELETE": "Error inesperado al eliminar en modo soft la entrada en Mongo.{}",
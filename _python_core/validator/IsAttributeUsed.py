@@ -19,11 +19,11 @@ class IsAttributeUsed(Validator):
         self, collection: str, query: Dict, repeated: int, ddbb: Database = None
     ) -> bool:
         ddbb = ddbb if ddbb else self.crud.mongoDB
-        crud = CrudOne(ddbb, self.lang)
+        crud = CrudOne(ddbb, self.lang, self.crud.engine)
         crud.set_collection(collection)
-        data = await crud.get(**query)
+        used: int = await crud.count(limit=repeated + 1, **query)
 
-        if len(data) == repeated:
+        if used == repeated:
             return True
         raise err.ErrorValidatorIsAttributeUsed(
             translate("ERROR_IS_ATTRIBUTE_USED", collection, lang=self.lang)
@@ -0,0 +1,78 @@
+"""Leaf comparison in GetDifferences: SHA-256 of str() against are_equal.
+
+Run from the tests folder: python benchmark_get_differences.py
+"""
+
+import os
+import sys
+import timeit
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from bson import ObjectId
+
+CURRENT_FOLDER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_FOLDER, ".."))
+
+from _python_core import functions as fn
+from _python_core.get_differences import GetDifferences, are_equal
+
+NUMBER = 20
+
+PAIRS: List[Tuple[Any, Any]] = [
+    (1, 1),
+    (1, 2),
+    (1.5, 1.5),
+    ("labor", "labor"),
+    ("labor", "equipment"),
+    (True, True),
+    (datetime(2024, 1, 1), datetime(2024, 1, 1)),
+    (ObjectId("65a000000000000000000000"), ObjectId("65a000000000000000000000")),
+    (1, "1"),
+    (None, 0),
+]
+
+
+def get_document(n: int) -> Dict:
+    return {
+        "name": "document",
+        "items": {
+            str(index): {
+                "quantity": index,
+                "price": index * 1.5,
+                "unit": "m2",
+                "date": datetime(2024, 1, 1),
+                "project": ObjectId("65a000000000000000000000"),
+            }
+            for index in range(n)
+        },
+    }
+
+
+def compare_with_hash() -> None:
+    for _ in range(10000):
+        for item1, item2 in PAIRS:
+            fn.getHash(item1) != fn.getHash(item2)
+
+
+def compare_with_are_equal() -> None:
+    for _ in range(10000):
+        for item1, item2 in PAIRS:
+            not are_equal(item1, item2)
+
+
+def diff_documents() -> None:
+    GetDifferences().calculate(get_document(2000), get_document(2000))
+
+
+def report(name: str, function: Callable) -> float:
+    seconds: float = min(timeit.repeat(function, number=1, repeat=NUMBER))
+    print(f"{name:<30}{seconds * 1000:>10.2f} ms")
+    return seconds
+
+
+if __name__ == "__main__":
+    hashed: float = report("getHash (100k pairs)", compare_with_hash)
+    compared: float = report("are_equal (100k pairs)", compare_with_are_equal)
+    print(f"{'speedup':<30}{hashed / compared:>10.1f} x")
+    report("calculate (10k leaves)", diff_documents)
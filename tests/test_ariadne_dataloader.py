@@ -0,0 +1,260 @@
+import asyncio
+import os
+import sys
+from typing import Any, Dict, List
+
+from bson import ObjectId
+
+from conftest import mongo_db
+
+CURRENT_FOLDER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_FOLDER, ".."))
+
+from _python_core.ariadne_dataloader import AriadneDataLoader, ForeignKeyDataLoader
+from _python_core.crud.crud_options import CrudOptions
+from _python_core.crud.crud_single import CrudOne
+from _python_core.reference_cache import referenceCache
+
+TData = Dict[str, Any]  # Type object as defined in GQL Schema
+
+
+class collection:
+    CRUD = "crud"
+
+
+class Entries:
+    collection: str = collection.CRUD
+
+    def __init__(self) -> None:
+        self.crud: CrudOne = CrudOne(mongo_db)
+        self.crud.set_collection(self.collection)
+        self.queries: List[Dict] = []
+
+    async def get_all(self, **filter: Any) -> List[TData]:
+        self.queries.append(filter)
+        return await self.crud.get(**filter)
+
+    async def get_all_unpaged(self, **filter: Any) -> List[TData]:
+        self.queries.append(filter)
+        return await self.crud.get_unpaged(**filter)
+
+    def get_crud_options(self) -> CrudOptions:
+        return self.crud.options
+
+
+async def insert_entries(entries: Entries, n: int) -> List[str]:
+    ids: List[str] = []
+    for index in range(n):
+        await entries.crud.insert_update({"loader": index})
+        ids.append(str(entries.crud.get_data()["_id"]))
+    return ids
+
+
+class TestAriadneDataLoader:
+    async def test_load_many_in_one_query(self) -> None:
+        entries: Entries = Entries()
+        ids: List[str] = await insert_entries(entries, 3)
+        missing: str = str(ObjectId())
+        loader: AriadneDataLoader = AriadneDataLoader.for_context({}, entries)
+
+        result = await loader.load_many([ids[2], missing, ids[0], ids[1]])
+
+        assert [entry["loader"] if entry else None for entry in result] == [2, None, 0, 1]
+        assert len(entries.queries) == 1
+        assert set(entries.queries[0]["_id"]["$in"]) == {ObjectId(id) for id in ids + [missing]}
+
+    async def test_repeated_keys(self) -> None:
+        entries: Entries = Entries()
+        ids: List[str] = await insert_entries(entries, 2)
+        loader: AriadneDataLoader = AriadneDataLoader({}, entries)
+
+        result = await loader.batch_load_fn([ids[0], ids[1], ids[0]])
+
+        assert [entry["loader"] for entry in result] == [0, 1, 0]
+        assert len(entries.queries[0]["_id"]["$in"]) == 2
+
+    async def test_paging_options_are_ignored(self) -> None:
+        entries: Entries = Entries()
+        ids: List[str] = await insert_entries(entries, 5)
+        entries.crud.options.set_pagination(1, 2)
+        entries.crud.options.set_cursors(after="invalid")
+        loader: AriadneDataLoader = AriadneDataLoader({}, entries)
+
+        result = await loader.load_many(ids)
+
+        assert [entry["loader"] for entry in result] == [0, 1, 2, 3, 4]
+        assert len(entries.queries) == 1
+
+    async def test_max_batch_size(self) -> None:
+        entries: Entries = Entries()
+        ids: List[str] = await insert_entries(entries, 5)
+        loader: AriadneDataLoader = AriadneDataLoader({}, entries, max_batch_size=2)
+
+        result = await asyncio.gather(*[loader.load(id) for id in ids])
+
+        assert [entry["loader"] for entry in result] == [0, 1, 2, 3, 4]
+        assert [len(query["_id"]["$in"]) for query in entries.queries] == [2, 2, 1]
+
+
+class TestForeignKeyDataLoader:
+    async def test_grouped_by_field(self) -> None:
+        entries: Entries = Entries()
+        parents: List[str] = [str(ObjectId()) for _ in range(3)]
+        for parent, n in zip(parents, [2, 0, 1]):
+            for _ in range(n):
+                await entries.crud.insert_update({"parentKey": parent})
+        loader: ForeignKeyDataLoader = ForeignKeyDataLoader.for_context({}, entries, "parentKey")
+
+        result = await loader.load_many(parents)
+
+        assert [len(children) for children in result] == [2, 0, 1]
+        assert all(child["parentKey"] == parents[0] for child in result[0])
+        assert len(entries.queries) == 1
+        assert set(entries.queries[0]["parentKey"]["$in"]) == set(parents)
+
+    async def test_nested_field_and_default_filters(self) -> None:
+        entries: Entries = Entries()
+        project: str = str(ObjectId())
+        await entries.crud.insert_update({"loaderProject": {"id": project}})
+        await entries.crud.insert_update({"loaderProject": {"id": project}})
+        await entries.crud.delete(str(entries.crud.get_data()["_id"]))
+        await entries.crud.insert_update({"loaderProject": {"id": project}, "active": False})
+        loader: ForeignKeyDataLoader = ForeignKeyDataLoader({}, entries, "loaderProject.id")
+
+        result = await loader.batch_load_fn([project, project])
+
+        assert [len(children) for children in result] == [1, 1]
+
+    async def test_options_limit_is_not_shared_by_keys(self) -> None:
+        entries: Entries = Entries()
+        parents: List[str] = [str(ObjectId()) for _ in range(2)]
+        for parent in parents:
+            for _ in range(3):
+                await entries.crud.insert_update({"parentKey": parent})
+        entries.crud.options.set_pagination(1, 2)
+        loader: ForeignKeyDataLoader = ForeignKeyDataLoader({}, entries, "parentKey")
+
+        result = await loader.load_many(parents)
+
+        assert [len(children) for children in result] == [3, 3]
+        assert len(entries.queries) == 1
+
+    async def test_loaders_by_collection_and_field(self) -> None:
+        entries: Entries = Entries()
+        context: Dict = {}
+        loader = ForeignKeyDataLoader.for_context(context, entries, "parentKey")
+
+        assert ForeignKeyDataLoader.for_context(context, entries, "parentKey") is loader
+        assert ForeignKeyDataLoader.for_context(context, entries, "other") is not loader
+        assert not isinstance(
+            AriadneDataLoader.for_context(context, entries), ForeignKeyDataLoader
+        )
+
+
+class TestPrimedLoader:
+    async def test_visibility_follows_options(self) -> None:
+        entries: Entries = Entries()
+        loader: AriadneDataLoader = AriadneDataLoader({}, entries)
+        ID: ObjectId = ObjectId()
+        entry: TData = {"_id": ID, "loader": 1, "active": False}
+
+        loader.prime_entries([entry])
+        assert await loader.load(str(ID)) is None
+
+        entries.crud.options.set_skipInactiveEntries(False)
+        loader.prime_entries([entry])
+        assert (await loader.load(str(ID)))["loader"] == 1
+        assert entries.queries == []
+
+    async def test_read_again_with_query_filters(self) -> None:
+        entries: Entries = Entries()
+        ID: str = (await insert_entries(entries, 1))[0]
+        entries.crud.options.additionalFilter = {"loader": 1}
+        loader: AriadneDataLoader = AriadneDataLoader({}, entries)
+
+        loader.prime_entries([{"_id": ObjectId(ID), "loader": 0}])
+        assert await loader.load(ID) is None
+        assert len(entries.queries) == 1
+
+
+class TestReferenceCacheLoader:
+    async def test_cached_between_requests_and_invalidated_on_write(self) -> None:
+        entries: Entries = Entries()
+        ids: List[str] = await insert_entries(entries, 2)
+        referenceCache.enable(collection.CRUD)
+        try:
+            await AriadneDataLoader.for_context({}, entries).load_many(ids)
+            result = await AriadneDataLoader.for_context({}, entries).load_many(ids)
+            assert [entry["loader"] for entry in result] == [0, 1]
+            assert len(entries.queries) == 1
+
+            await entries.crud.insert_update({"_id": ids[0], "loader": 10})
+            result = await AriadneDataLoader.for_context({}, entries).load_many(ids)
+            assert [entry["loader"] for entry in result] == [10, 1]
+            assert entries.queries[-1]["_id"]["$in"] == [ObjectId(ids[0])]
+
+            await entries.crud.delete(ids[1])
+            result = await AriadneDataLoader.for_context({}, entries).load_many(ids)
+            assert result[1] is None
+        finally:
+            referenceCache.disable(collection.CRUD)
+
+
+class TestProjectionLoader:
+    async def test_projections_merged_in_batch(self) -> None:
+        entries: Entries = Entries()
+        await entries.crud.insert_update({"loader": 0, "name": "zero", "big": [1] * 100})
+        ID: str = str(entries.crud.get_data()["_id"])
+        ids: List[str] = [ID] + await insert_entries(entries, 1)
+        loader: AriadneDataLoader = AriadneDataLoader({}, entries)
+
+        result = await asyncio.gather(
+            loader.load_with_projection(ids[0], {"name": 1}),
+            loader.load_with_projection(ids[1], {"loader": 1}),
+        )
+
+        assert len(entries.queries) == 1
+        assert set(entries.queries[0]["projection"]) - {"_id"} == {"loader", "name"}
+        assert result[0] == {"_id": ObjectId(ID), "loader": 0, "name": "zero"}
+
+        await loader.load_with_projection(ids[0], {"name": 1})
+        assert len(entries.queries) == 1
+
+        result = await loader.load_with_projection(ids[0], {"big": 1})
+        assert len(entries.queries) == 2
+        assert set(entries.queries[1]["projection"]) - {"_id"} == {"big"}
+        assert len(result["big"]) == 100
+
+    async def test_whole_document_when_any_key_needs_it(self) -> None:
+        entries: Entries = Entries()
+        ids: List[str] = await insert_entries(entries, 2)
+        loader: AriadneDataLoader = AriadneDataLoader({}, entries)
+
+        result = await asyncio.gather(
+            loader.load_with_projection(ids[0], {"loader": 1}), loader.load(ids[1])
+        )
+
+        assert entries.queries[0]["projection"] is None
+        assert "createDate" in result[0]
+
+        await loader.load_with_projection(ids[1], {"loader": 1})
+        assert len(entries.queries) == 1
+
+    async def test_plain_load_after_projected_load(self) -> None:
+        entries: Entries = Entries()
+        ids: List[str] = await insert_entries(entries, 2)
+        loader: AriadneDataLoader = AriadneDataLoader({}, entries)
+
+        result = await asyncio.gather(
+            loader.load_with_projection(ids[0], {"loader": 1}), loader.load(ids[0])
+        )
+        assert entries.queries[0]["projection"] is None
+        assert "createDate" in result[1]
+
+        await loader.load_with_projection(ids[1], {"loader": 1})
+        result = await loader.load(ids[1])
+        assert len(entries.queries) == 3
+        assert entries.queries[2]["projection"] is None
+        assert "createDate" in result
+        assert "createDate" in (await loader.load_many(ids))[1]
+        assert len(entries.queries) == 3
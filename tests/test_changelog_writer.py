@@ -0,0 +1,164 @@
+import asyncio
+import os
+import sys
+from typing import Any, Dict, List
+
+import pytest
+from bson import ObjectId
+
+from conftest import mongo_db
+
+CURRENT_FOLDER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_FOLDER, ".."))
+
+from _python_core import Errors as err
+from _python_core.crud.changelog_writer import ChangelogWriter
+from _python_core.crud.crud_engine import PymongoEngine, ThreadPoolEngine
+from _python_core.crud.crud_many import CrudMany
+from _python_core.crud.crud_single import CrudOne
+
+TData = Dict[str, Any]  # Type object as defined in GQL Schema
+
+
+class collection:
+    CRUD = "crud"
+    CHANGELOG = "changeLog"
+
+
+class FailingEngine(PymongoEngine):
+    async def insert_many(self, *args: Any, **kwargs: Any) -> Any:
+        raise Exception("Mongo is down")
+
+
+def get_changelog(id: ObjectId) -> List[TData]:
+    return list(mongo_db[collection.CHANGELOG].find({"parentID": str(id)}))
+
+
+class TestChangelogWriter:
+    async def test_crud_one_changelog_is_written_behind(self) -> None:
+        writer: ChangelogWriter = ChangelogWriter(mongo_db, flush_interval=60)
+        crud: CrudOne = CrudOne(mongo_db)
+        crud.set_collection(collection.CRUD)
+        crud.set_changelog_writer(writer)
+
+        await crud.insert_update({"one": 1})
+        ID: ObjectId = crud.get_data()["_id"]
+        await crud.insert_update({"_id": ID, "one": 2})
+        assert get_changelog(ID) == []
+        assert writer.get_metrics()["queueDepth"] == 2
+
+        await writer.close()
+        changelog: List[TData] = get_changelog(ID)
+        assert [entry["action"] for entry in changelog] == ["Create", "Update"]
+        assert changelog[1]["changeLog"] == [{"field": "one", "oldValue": "1", "newValue": "2"}]
+        assert changelog[1]["collection"] == collection.CRUD
+        assert "createDate" in changelog[1]
+        assert writer.get_metrics()["written"] == 2
+        assert writer.get_metrics()["flushes"] == 1
+
+    async def test_flush_by_size(self) -> None:
+        writer: ChangelogWriter = ChangelogWriter(mongo_db, batch_size=2, flush_interval=60)
+        ID: ObjectId = ObjectId()
+        await writer.put([{"parentID": str(ID)}, {"parentID": str(ID)}])
+        for _ in range(100):
+            if writer.get_metrics()["written"]:
+                break
+            await asyncio.sleep(0.01)
+
+        assert len(get_changelog(ID)) == 2
+        await writer.close()
+
+    async def test_flush_by_time(self) -> None:
+        writer: ChangelogWriter = ChangelogWriter(mongo_db, flush_interval=0.01)
+        ID: ObjectId = ObjectId()
+        await writer.put([{"parentID": str(ID)}])
+        await asyncio.sleep(0.05)
+
+        assert len(get_changelog(ID)) == 1
+        await writer.close()
+
+    async def test_backpressure(self) -> None:
+        writer: ChangelogWriter = ChangelogWriter(
+            mongo_db, max_queue_size=2, batch_size=2, flush_interval=60
+        )
+        ID: ObjectId = ObjectId()
+        await writer.put([{"parentID": str(ID)} for _ in range(5)])
+        assert writer.get_metrics()["queueDepth"] <= 2
+
+        await writer.flush()
+        assert len(get_changelog(ID)) == 5
+        assert writer.get_metrics()["enqueued"] == 5
+        await writer.close()
+
+    async def test_failed_flush_metrics(self) -> None:
+        writer: ChangelogWriter = ChangelogWriter(mongo_db, engine=FailingEngine())
+        await writer.put([{"parentID": "1"}, {"parentID": "2"}])
+        await writer.close()
+
+        metrics: Dict[str, Any] = writer.get_metrics()
+        assert metrics["failedFlushes"] == 1
+        assert metrics["failedEntries"] == 2
+        assert metrics["written"] == 0
+        assert metrics["lastError"] == "Mongo is down"
+
+    async def test_default_engine_does_not_block_the_loop(self) -> None:
+        writer: ChangelogWriter = ChangelogWriter(mongo_db, flush_interval=60)
+        assert isinstance(writer.engine, ThreadPoolEngine)
+
+        ID: ObjectId = ObjectId()
+        await writer.put([{"parentID": str(ID)}])
+        await writer.close()
+        assert len(get_changelog(ID)) == 1
+        assert writer.engine.get_metrics()["completed"] == 1
+
+    async def test_put_waiting_for_room_during_close(self) -> None:
+        writer: ChangelogWriter = ChangelogWriter(
+            mongo_db, engine=PymongoEngine(), max_queue_size=1, flush_interval=60
+        )
+        ID: ObjectId = ObjectId()
+        await writer.put([{"parentID": str(ID)}])
+        waiting: asyncio.Task = asyncio.create_task(writer.put([{"parentID": str(ID)}]))
+        await asyncio.sleep(0)
+
+        await writer.close()
+        await waiting
+        assert len(get_changelog(ID)) == 2
+        assert writer.get_metrics()["written"] == writer.get_metrics()["enqueued"] == 2
+
+    async def test_flush_after_task_died(self) -> None:
+        writer: ChangelogWriter = ChangelogWriter(
+            mongo_db, engine=PymongoEngine(), flush_interval=60
+        )
+        ID: ObjectId = ObjectId()
+        await writer.put([{"parentID": str(ID)}])
+        writer._task.cancel()
+        await asyncio.sleep(0)
+
+        await writer.flush()
+        assert len(get_changelog(ID)) == 1
+        assert writer.get_metrics()["queueDepth"] == 0
+        await writer.close()
+
+    async def test_put_after_close(self) -> None:
+        writer: ChangelogWriter = ChangelogWriter(mongo_db)
+        await writer.close()
+        with pytest.raises(err.ErrorBase):
+            await writer.put([{"parentID": "1"}])
+
+    async def test_crud_many_changelog_is_written_behind(self) -> None:
+        writer: ChangelogWriter = ChangelogWriter(mongo_db, flush_interval=60)
+        crudMany: CrudMany = CrudMany(mongo_db)
+        crudMany.set_collection(collection.CRUD)
+        crudMany.set_changelog_writer(writer)
+        crudMany.options.set_bulkWrite(True)
+
+        await crudMany.insert_update([{"writer": 1}, {"writer": 2}])
+        IDs: List[ObjectId] = [entry["_id"] for entry in crudMany.get_data()]
+        assert all(get_changelog(ID) == [] for ID in IDs)
+
+        crudMany.options.set_bulkWrite(False)
+        await crudMany.insert_update([{"writer": 3}])
+        IDs.append(crudMany.get_data()[0]["_id"])
+
+        await writer.close()
+        assert all(len(get_changelog(ID)) == 1 for ID in IDs)
@@ -1,6 +1,7 @@
 import os
 import sys
 import copy
+from types import SimpleNamespace
 from typing import Dict, List, Union
 
 import pytest
@@ -10,6 +11,7 @@ CURRENT_FOLDER = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.join(CURRENT_FOLDER, ".."))
 
 import _python_core.Errors as err
+from _python_core.ariadne_dataloader import AriadneDataLoader
 from _python_core.http_codes import HTTPCode
 from _python_core.crud.crud_many import CrudMany, TData
 from _python_core.translations import Translations as tr
@@ -102,6 +104,16 @@ class TestClasses_Single:
         data = await self.single.get_by_id(data_id)
         assert data["code"] == 1
 
+    async def test_SingleObjects_get_by_ids(self) -> None:
+        data_id = ObjectId()
+        entry = {"_id": data_id, "code": 1}
+        self.single.set_schema(entry)
+        await self.single.insert_update()
+
+        data = await self.single.get_by_ids([ObjectId(), data_id])
+        assert data[0] is None
+        assert data[1]["code"] == 1
+
     async def test_SingleObjects_get_with_limit(self) -> None:
         data_id = ObjectId()
         entry = {"_id": data_id, "code": 1}
@@ -308,6 +320,14 @@ class TestClasses_Many:
         data = await self.many.get_by_id(data_id)
         assert data["code"] == 1
 
+    async def test_ManyObjects_get_by_ids(self) -> None:
+        data_id = ObjectId()
+        await self.test_ManyObjects_insertUpdate(data_id)
+
+        data = await self.many.get_by_ids([data_id, "invalid"])
+        assert data[0]["code"] == 1
+        assert data[1] is None
+
     async def test_ManyObjects_get_with_limit(self) -> None:
         data_id = ObjectId()
         await self.test_ManyObjects_insertUpdate(data_id)
@@ -506,6 +526,52 @@ def assertMessageUpdateMany(savedMessage: str, message: str) -> None:
     assert tr.translate(message)[:-2] in savedMessage
 
 
+class TestPrimeLoader:
+    def get_info(self) -> SimpleNamespace:
+        return SimpleNamespace(context={})
+
+    async def test_single_prime_after_insert_update_and_delete(self) -> None:
+        info: SimpleNamespace = self.get_info()
+        single = mc.MockSingleObject(info=info)
+        single.set_crud(mongo_db)
+        single.set_schema({"code": "prime"})
+        await single.insert_update()
+        ID: ObjectId = single.get_data()["_id"]
+        loader: AriadneDataLoader = AriadneDataLoader.for_context(info.context, single)
+
+        # Served from memory: the entry is not read again
+        mongo_db[mc.MockBase.collection].update_one({"_id": ID}, {"$set": {"code": "db"}})
+        assert (await loader.load(str(ID)))["code"] == "prime"
+
+        single.set_schema({"_id": ID, "code": "updated"})
+        await single.insert_update()
+        assert (await loader.load(str(ID)))["code"] == "updated"
+
+        single.set_schema({"_id": ID})
+        await single.delete()
+        assert await loader.load(str(ID)) is None
+
+    async def test_many_prime_after_insert_update_and_delete(self) -> None:
+        info: SimpleNamespace = self.get_info()
+        many = mc.MockManyObjects(info=info)
+        many.set_crud(mongo_db)
+        many.set_schemas([{"code": "prime1"}, {"code": "prime2", "active": False}])
+        await many.insert_update()
+        IDs: List[str] = [str(entry["_id"]) for entry in many.get_data()]
+        loader: AriadneDataLoader = AriadneDataLoader.for_context(info.context, many)
+
+        assert [entry and entry["code"] for entry in await loader.load_many(IDs)] == [
+            "prime1",
+            None,
+        ]
+
+        many = mc.MockManyObjects(info=info)
+        many.set_crud(mongo_db)
+        many.set_schemas([{"_id": IDs[0]}])
+        await many.delete()
+        assert await loader.load(IDs[0]) is None
+
+
 class TestErrors:
     def test_error_ErrorBase(self) -> None:
         with pytest.raises(err.ErrorBase):
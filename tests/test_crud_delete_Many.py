@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 from typing import Any, Dict, List
@@ -249,6 +250,73 @@ class TestCRUD_Hard_Delete_Many:
         await self.crudMany.insert_update(entries)
 
 
+class TestCRUD_Soft_Delete_ManyBulk(TestCRUD_Soft_Delete_Many):
+    crudMany: CrudMany = CrudMany(mongo_db)
+    crudMany.set_collection(collection.CRUD)
+    crudMany.options.set_softDelete(True)
+    crudMany.options.set_bulkWrite(True)
+
+    async def insert_data(self, ID1: ObjectId = ObjectId(), ID2: ObjectId = ObjectId()) -> None:
+        # Changelogs are sorted by createDate, which bulk writes are fast enough to repeat
+        entries: List[TData] = [{"_id": ID1, "one": 1}, {"_id": ID2, "one": 1}]
+        await self.crudMany.insert_update(entries)
+        await asyncio.sleep(0.002)
+
+        entries[0]["one"] = 2
+        entries[1]["one"] = 5
+        await self.crudMany.insert_update(entries)
+        await asyncio.sleep(0.002)
+
+    async def test_soft_delete_bulk_repeated_id(self) -> None:
+        self.crudMany.set_collection(collection.CRUD)
+        ID1: ObjectId = ObjectId()
+        await self.crudMany.insert_update([{"_id": ID1, "one": 1}])
+        await self.crudMany.delete([str(ID1), str(ID1)])
+
+        assertSoftDeleteMany(
+            self.crudMany,
+            HTTPCode.CODE_200,
+            [HTTPCode.CODE_200, HTTPCode.CODE_200],
+            ["MSG_SUCCESSFULLY_SOFT_DELETED", "MSG_SUCCESSFULLY_SOFT_DELETED"],
+            [[CREATE, DELETE], [CREATE, DELETE]],
+        )
+        assert (
+            self.crudMany.get_data()[0][DELETED_DATE] == self.crudMany.get_data()[1][DELETED_DATE]
+        )
+
+
+class TestCRUD_Hard_Delete_ManyBulk(TestCRUD_Hard_Delete_Many):
+    crudMany: CrudMany = CrudMany(mongo_db)
+    crudMany.set_collection(collection.CRUD)
+    crudMany.options.set_softDelete(False)
+    crudMany.options.set_bulkWrite(True)
+
+    async def insert_data(self, ID1: ObjectId = ObjectId(), ID2: ObjectId = ObjectId()) -> None:
+        # Changelogs are sorted by createDate, which bulk writes are fast enough to repeat
+        entries: List[TData] = [{"_id": ID1, "one": 1}, {"_id": ID2, "one": 1}]
+        await self.crudMany.insert_update(entries)
+        await asyncio.sleep(0.002)
+
+        entries[0]["one"] = 2
+        entries[1]["one"] = 5
+        await self.crudMany.insert_update(entries)
+        await asyncio.sleep(0.002)
+
+    async def test_hard_delete_bulk_repeated_id(self) -> None:
+        self.crudMany.set_collection(collection.CRUD)
+        ID1: ObjectId = ObjectId()
+        await self.crudMany.insert_update([{"_id": ID1, "one": 1}])
+        await self.crudMany.delete([str(ID1), str(ID1)])
+
+        assertHardDeleteMany(
+            self.crudMany,
+            HTTPCode.CODE_400,
+            [HTTPCode.CODE_200, HTTPCode.CODE_400],
+            ["MSG_SUCCESSFULLY_HARD_DELETED"],
+        )
+        assert self.crudMany.get_errors() == [tr.translate("ERROR_UNEXISTING_DATA")]
+
+
 def assertChangeLogDelete(changelogs: List[TData], newValue: str) -> None:
     assert len(changelogs) == 3
     assert changelogs[0]["changeLog"] == []
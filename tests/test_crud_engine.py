@@ -0,0 +1,156 @@
+import asyncio
+import os
+import sys
+from typing import Any, Dict, List
+
+from bson import ObjectId
+
+from conftest import mongo_db
+
+CURRENT_FOLDER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_FOLDER, ".."))
+
+from _python_core.crud.crud_engine import MotorEngine, PymongoEngine, ThreadPoolEngine
+from _python_core.crud.crud_many import CrudMany
+from _python_core.crud.crud_single import CrudOne
+from _python_core.http_codes import HTTPCode
+from _python_core.translations import Translations as tr
+
+TData = Dict[str, Any]  # Type object as defined in GQL Schema
+
+
+class collection:
+    CRUD = "crud"
+    CHANGELOG = "changeLog"
+
+
+class AwaitableCursor:
+    def __init__(self, cursor: Any) -> None:
+        self.cursor = cursor
+
+    def sort(self, *args: Any) -> "AwaitableCursor":
+        self.cursor = self.cursor.sort(*args)
+        return self
+
+    def skip(self, skip: int) -> "AwaitableCursor":
+        self.cursor = self.cursor.skip(skip)
+        return self
+
+    def limit(self, limit: int) -> "AwaitableCursor":
+        self.cursor = self.cursor.limit(limit)
+        return self
+
+    async def to_list(self, length: Any = None) -> List[TData]:
+        return list(self.cursor)
+
+
+class AwaitableCollection:
+    """Motor-like collection on top of mongomock"""
+
+    def __init__(self, collection: Any) -> None:
+        self.collection = collection
+
+    def find(self, *args: Any) -> AwaitableCursor:
+        return AwaitableCursor(self.collection.find(*args))
+
+    def __getattr__(self, name: str) -> Any:
+        method = getattr(self.collection, name)
+
+        async def wrapped(*args: Any, **kwargs: Any) -> Any:
+            return method(*args, **kwargs)
+
+        return wrapped
+
+
+class AwaitableDatabase:
+    def __init__(self, database: Any) -> None:
+        self.database = database
+
+    def __getitem__(self, name: str) -> AwaitableCollection:
+        return AwaitableCollection(self.database[name])
+
+
+motor_db = AwaitableDatabase(mongo_db)
+
+
+class TestCrudEngine:
+    def test_default_engine(self) -> None:
+        crud: CrudOne = CrudOne(mongo_db)
+        assert isinstance(crud.engine, PymongoEngine)
+
+    def test_engine_is_shared_with_children(self) -> None:
+        engine = MotorEngine()
+        crudMany: CrudMany = CrudMany(motor_db, engine=engine)
+        crudMany.set_collection(collection.CRUD)
+        assert crudMany.engine is engine
+        assert crudMany.crud.engine is engine
+        assert CrudOne.copy(crudMany.crud).engine is engine
+
+
+class TestMotorEngine:
+    crud: CrudOne = CrudOne(motor_db, engine=MotorEngine())
+    crud.set_collection(collection.CRUD)
+
+    async def test_insert_update_and_get(self) -> None:
+        await self.crud.insert_update({"one": 1})
+        assert self.crud.get_http_code() == HTTPCode.CODE_200
+        _id: ObjectId = self.crud.get_data()["_id"]
+
+        await self.crud.insert_update({"_id": _id, "one": 2})
+        assert self.crud.get_message() == tr.translate("MSG_SUCCESSFULLY_UPDATED").format(
+            {"one": 2}
+        )
+        assert (await self.crud.get_by_id(_id))["one"] == 2
+        assert (await self.crud.get_single(_id=_id))["one"] == 2
+        assert len(await self.crud.get(_id=_id)) == 1
+        assert await self.crud.count(_id=_id) == 1
+
+        changelog = list(mongo_db[collection.CHANGELOG].find({"parentID": str(_id)}))
+        assert [entry["action"] for entry in changelog] == ["Create", "Update"]
+        assert changelog[1]["changeLog"] == [{"field": "one", "oldValue": "1", "newValue": "2"}]
+
+    async def test_soft_and_hard_delete(self) -> None:
+        await self.crud.insert_update({"one": 1})
+        _id: str = str(self.crud.get_data()["_id"])
+
+        await self.crud.delete(_id)
+        assert self.crud.get_http_code() == HTTPCode.CODE_200
+        assert await self.crud.get(_id=ObjectId(_id)) == []
+
+        self.crud.options.set_softDelete(False)
+        await self.crud.delete(_id)
+        self.crud.options.set_softDelete(True)
+        assert await self.crud.get_by_id(_id) is None
+
+
+class TestThreadPoolEngine:
+    engine: ThreadPoolEngine = ThreadPoolEngine(max_workers=2)
+    crud: CrudOne = CrudOne(mongo_db, engine=engine)
+    crud.set_collection(collection.CRUD)
+
+    async def test_insert_update_delete(self) -> None:
+        await self.crud.insert_update({"one": 1})
+        _id: ObjectId = self.crud.get_data()["_id"]
+        await self.crud.insert_update({"_id": _id, "one": 2})
+        assert self.crud.get_message() == tr.translate("MSG_SUCCESSFULLY_UPDATED").format(
+            {"one": 2}
+        )
+
+        await self.crud.delete(str(_id))
+        assert self.crud.get_http_code() == HTTPCode.CODE_200
+        assert await self.crud.get(_id=_id) == []
+        assert await self.crud.count(_id=_id) == 0
+
+    async def test_concurrent_calls_and_metrics(self) -> None:
+        await self.crud.insert_update({"one": 1})
+        _id: ObjectId = self.crud.get_data()["_id"]
+        completed: int = self.engine.get_metrics()["completed"]
+
+        results = await asyncio.gather(*[self.crud.get_by_id(_id) for _ in range(10)])
+
+        assert all(result["_id"] == _id for result in results)
+        metrics: Dict[str, int] = self.engine.get_metrics()
+        assert metrics["maxWorkers"] == 2
+        assert metrics["queueDepth"] == 0
+        assert metrics["running"] == 0
+        assert metrics["completed"] == completed + 10
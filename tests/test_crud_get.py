@@ -34,6 +34,7 @@ from _python_core.crud.crud_constants import (
 )
 from _python_core.crud.crud_single import CrudOne
 from _python_core.crud.crud_options import CrudOptions
+from _python_core.crud.keyset_cursor import get_keyset_projection
 from _python_core.translations import Translations as tr
 from _python_core import Errors as err
 
@@ -436,6 +437,160 @@ class TestCrudGetWitProjection:
 
         assert "You cannot currently mix" in str(excinfo)
 
+    async def test_projection_argument(self) -> None:
+        crud: CrudOne = CrudOne(mongo_db)
+        crud.set_options(CrudOptions(PROJECT_ID, USER))
+        crud.set_collection(collection.CRUD)
+        _id = ObjectId()
+        await crud.insert_update({PROJECT_ID: _id, NAME: "name", "pe": "pa"})
+
+        crud.options.set_projection({"pe": 1})
+
+        retrievedData: List[TData] = await crud.get(projection={NAME: 1}, **{PROJECT_ID: _id})
+
+        assert retrievedData[0].get(NAME) == "name"
+        assert not retrievedData[0].get("pe")
+
+
+class TestCrudGetByIDs:
+    crud: CrudOne = CrudOne(mongo_db)
+    crud.set_collection(collection.CRUD)
+
+    async def test_get_by_ids(self) -> None:
+        ID1: str = str(ObjectId())
+        ID2: str = str(ObjectId())
+        await insert_one_by_id(ID1, self.crud)
+        await insert_one_by_id(ID2, self.crud)
+        missing: ObjectId = ObjectId()
+
+        retrievedData: List[TData] = await self.crud.get_by_ids(
+            [ID2, "invalid", missing, ObjectId(ID1), ID2]
+        )
+
+        assert [data["_id"] if data else None for data in retrievedData] == [
+            ObjectId(ID2),
+            None,
+            None,
+            ObjectId(ID1),
+            ObjectId(ID2),
+        ]
+
+    async def test_get_by_ids_projection(self) -> None:
+        ID: str = str(ObjectId())
+        await insert_one_by_id(ID, self.crud)
+
+        retrievedData: List[TData] = await self.crud.get_by_ids([ID], projection={"one": 1})
+
+        assert set(retrievedData[0]) == {"_id", "one"}
+
+    async def test_get_by_ids_chunks(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("_python_core.crud.crud.MAX_IDS_PER_QUERY", 2)
+        ids: List[str] = [str(ObjectId()) for _ in range(5)]
+        for ID in ids:
+            await insert_one_by_id(ID, self.crud)
+        queries: List[Dict] = []
+        find = self.crud.engine.find
+
+        async def recording_find(mongo: Any, filter: Dict, *args: Any, **kwargs: Any) -> Any:
+            queries.append(filter)
+            return await find(mongo, filter, *args, **kwargs)
+
+        monkeypatch.setattr(self.crud.engine, "find", recording_find)
+        retrievedData: List[TData] = await self.crud.get_by_ids(ids)
+
+        assert [str(data["_id"]) for data in retrievedData] == ids
+        assert [len(query["_id"]["$in"]) for query in queries] == [2, 2, 1]
+
+
+class TestCrudCount:
+    async def test_count(self) -> None:
+        crud: CrudOne = await get_crud_with_n_entries(4)
+        await crud.delete(str(crud.get_data()["_id"]))
+
+        assert await crud.count() == 3
+        assert await crud.count(page={"$gt": 0}) == 2
+        assert await crud.count(limit=1) == 1
+        crud.mongoDB.drop_collection(crud.collection)
+
+    async def test_estimated_count(self) -> None:
+        crud: CrudOne = await get_crud_with_n_entries(3)
+        await crud.delete(str(crud.get_data()["_id"]))
+
+        assert await crud.count(estimated=True) == 2
+        crud.options.set_skipDeletedEntries(False)
+        crud.options.set_skipInactiveEntries(False)
+        assert await crud.count(estimated=True) == 3
+        crud.mongoDB.drop_collection(crud.collection)
+
+    async def test_get_with_total(self) -> None:
+        crud: CrudOne = await get_crud_with_n_entries(5)
+        crud.options.set_pagination(1, 2)
+
+        result: TData = await crud.get_with_total(page={"$lt": 4})
+
+        assert sorted(entry["page"] for entry in result["data"]) == [0, 1]
+        assert result["total"] == 4
+        crud.mongoDB.drop_collection(crud.collection)
+
+    async def test_get_unpaged(self) -> None:
+        crud: CrudOne = await get_crud_with_n_entries(5)
+        await crud.delete(str(crud.get_data()["_id"]))
+        crud.options.set_pagination(1, 2)
+        crud.options.set_sort([("page", -1)])
+
+        result: List[TData] = await crud.get_unpaged(page={"$lt": 4})
+
+        assert [entry["page"] for entry in result] == [3, 2, 1, 0]
+        crud.mongoDB.drop_collection(crud.collection)
+
+
+class TestCrudQueryPlan:
+    async def test_sort_does_not_grow(self) -> None:
+        crud: CrudOne = await get_crud_with_n_entries(1)
+        sort: List = [("page", ASCENDING)]
+        crud.options.set_sort(sort)
+
+        for _ in range(3):
+            await crud.get()
+            await crud.get_single(sort)
+            await crud.get_with_limit(1, sort)
+
+        assert sort == [("page", ASCENDING)]
+        assert crud.options.sort == [("page", ASCENDING)]
+        assert crud._get_query_plan().sort == (("page", ASCENDING), (CREATE_DATE, -1))
+        assert crud._get_query_plan([]).sort == ((CREATE_DATE, -1),)
+        crud.mongoDB.drop_collection(crud.collection)
+
+    async def test_plan_reused_until_options_change(self) -> None:
+        crud: CrudOne = await get_crud_with_n_entries(3)
+        plan = crud._get_query_plan()
+        assert crud._get_query_plan() is plan
+
+        crud.options.set_limit(1)
+        assert crud._get_query_plan() is not plan
+        assert len(await crud.get()) == 1
+
+        crud.options.additionalFilter["page"] = {"$gt": 1}
+        crud.options.set_limit(0)
+        assert [entry["page"] for entry in await crud.get()] == [2]
+        crud.mongoDB.drop_collection(crud.collection)
+
+    async def test_returned_filter_does_not_change_the_plan(self) -> None:
+        crud: CrudOne = await get_crud_with_n_entries(3)
+        crud.options.additionalFilter = {"$and": [{"page": {"$gte": 1}}]}
+        crud.options.set_projection({"page": 1, "list": {"$slice": 2}})
+        plan = crud._get_query_plan()
+
+        plan.get_filter({})["$and"].append({"page": {"$gt": 5}})
+        plan.get_projection()["list"]["$slice"] = 5
+
+        assert crud.options.additionalFilter == {"$and": [{"page": {"$gte": 1}}]}
+        assert crud._get_query_plan() is plan
+        assert plan.get_filter({})["$and"] == [{"page": {"$gte": 1}}]
+        assert plan.get_projection() == {"page": 1, "list": {"$slice": 2}}
+        assert sorted(entry["page"] for entry in await crud.get()) == [1, 2]
+        crud.mongoDB.drop_collection(crud.collection)
+
 
 class TestCrudGetWithLimit:
     crud: CrudOne = CrudOne(mongo_db)
@@ -635,6 +790,105 @@ class TestCrudGetPagination:
             await self.crud.insert_update({"_id": id})
 
 
+class TestCrudGetKeysetPagination:
+    async def test_get_page_forward_and_backward(self) -> None:
+        crud: CrudOne = await get_crud_with_n_entries(5)
+        crud.options.set_limit(2)
+
+        pages: List[TData] = [await crud.get_page()]
+        while pages[-1]["pageInfo"]["hasNextPage"]:
+            crud.options.set_cursors(after=pages[-1]["pageInfo"]["endCursor"])
+            pages.append(await crud.get_page())
+
+        assert [[entry["page"] for entry in page["data"]] for page in pages] == [
+            [4, 3],
+            [2, 1],
+            [0],
+        ]
+        assert [page["pageInfo"]["hasPreviousPage"] for page in pages] == [False, True, True]
+
+        crud.options.set_cursors(before=pages[2]["pageInfo"]["startCursor"])
+        page: TData = await crud.get_page()
+        assert [entry["page"] for entry in page["data"]] == [2, 1]
+        assert page["pageInfo"]["hasPreviousPage"] and page["pageInfo"]["hasNextPage"]
+
+        crud.options.set_cursors(before=page["pageInfo"]["startCursor"])
+        page = await crud.get_page()
+        assert [entry["page"] for entry in page["data"]] == [4, 3]
+        assert not page["pageInfo"]["hasPreviousPage"]
+        crud.mongoDB.drop_collection(crud.collection)
+
+    async def test_get_with_cursor_and_sort(self) -> None:
+        crud: CrudOne = await get_crud_with_n_entries(4)
+        crud.options.set_limit(2)
+        crud.options.set_sort([("page", ASCENDING)])
+        crud.options.set_projection({"page": 1})
+        page: TData = await crud.get_page()
+
+        crud.options.set_optionsFromGQL(
+            limit=2, sort='[{"page": "asc"}]', after=page["pageInfo"]["endCursor"]
+        )
+        returned_data: List[TData] = await crud.get()
+
+        assert [entry["page"] for entry in page["data"]] == [0, 1]
+        assert [entry["page"] for entry in returned_data] == [2, 3]
+        crud.mongoDB.drop_collection(crud.collection)
+
+    async def test_nested_sort_key_and_parent_projection(self) -> None:
+        crud: CrudOne = CrudOne(mongo_db)
+        crud.set_collection(f"{collection.CRUD_PAGINATION}_{ObjectId()}")
+        for index in range(3):
+            await crud.insert_update({"project": {"name": index, "code": -index}, "one": 1})
+        crud.options.set_limit(2)
+        crud.options.set_sort([("project.name", ASCENDING)])
+        crud.options.set_projection({"project": 1})
+
+        first: TData = await crud.get_page()
+        crud.options.set_cursors(after=first["pageInfo"]["endCursor"])
+        second: TData = await crud.get_page()
+
+        assert [entry["project"]["name"] for entry in first["data"]] == [0, 1]
+        assert [entry["project"]["name"] for entry in second["data"]] == [2]
+        assert second["data"][0]["project"]["code"] == -2
+        assert "one" not in second["data"][0]
+        crud.mongoDB.drop_collection(crud.collection)
+
+    def test_keyset_projection_without_path_collisions(self) -> None:
+        sort: List = [("project.name", 1), ("_id", 1)]
+        assert get_keyset_projection({"project": 1}, sort) == {"project": 1, "_id": 1}
+        assert get_keyset_projection({"project.name": 1, "one": 1}, [("project", 1)]) == {
+            "one": 1,
+            "project": 1,
+        }
+        assert get_keyset_projection({"projectName": 1}, sort) == {
+            "projectName": 1,
+            "project.name": 1,
+            "_id": 1,
+        }
+
+    async def test_invalid_cursor(self) -> None:
+        crud: CrudOne = await get_crud_with_n_entries(1)
+        crud.options.set_cursors(after="invalid")
+
+        with pytest.raises(err.ErrorBase):
+            await crud.get_page()
+        crud.mongoDB.drop_collection(crud.collection)
+
+
+async def get_crud_with_n_entries(n: int) -> CrudOne:
+    crud: CrudOne = CrudOne(mongo_db)
+    crud.set_collection(f"{collection.CRUD_PAGINATION}_{ObjectId()}")
+    createDate: datetime = datetime.now().replace(microsecond=0)
+    for index in range(n):
+        # Two entries per createDate, so the _id tiebreaker is needed
+        await crud.insert_update({"page": index})
+        crud.mongo.update_one(
+            {"_id": crud.get_data()["_id"]},
+            {"$set": {CREATE_DATE: createDate + timedelta(seconds=index // 2)}},
+        )
+    return crud
+
+
 def assert_createdData_equals_retievedData(createdData: TData, retrievedData: TData) -> None:
     for elm in createdData:
         if elm not in OMIT_FIELDS:
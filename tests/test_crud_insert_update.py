@@ -31,8 +31,10 @@ from _python_core.crud.crud_constants import (
     MODIFIED_USER,
 )
 from _python_core.crud.crud import ErrorCRUD
+from _python_core.crud.crud_engine import PymongoEngine
 from _python_core.crud.crud_single import CrudOne
 from _python_core.crud.crud_options import CrudOptions
+from _python_core.get_differences import GetDifferences
 from _python_core.translations import Translations as tr
 
 TData = Dict[str, Any]  # Type object as defined in GQL Schema
@@ -423,3 +425,256 @@ def assertData(schema: TData, entry: TData) -> None:
 
 def assertMessage(savedMessage: List[str], msg: str, lang: str = "en") -> None:
     assert tr.translate(msg, lang)[:30] in savedMessage
+
+
+class TestCRUD_InsertOneUpsert(TestCRUD_InsertOne):
+    crud: CrudOne = CrudOne(mongo_db)
+    crud.set_collection(collection.CRUD)
+    crud.options.set_upsert(True)
+
+
+class TestCRUD_UpdateOneUpsert(TestCRUD_UpdateOne):
+    crud: CrudOne = CrudOne(mongo_db)
+    crud.set_collection(collection.CRUD)
+    crud.options.set_upsert(True)
+
+    async def test_upsert_round_trips(self) -> None:
+        class CountingEngine(PymongoEngine):
+            calls: List[str] = []
+
+            async def find_one(self, *args: Any, **kwargs: Any) -> Any:
+                self.calls.append("find_one")
+                return await super().find_one(*args, **kwargs)
+
+            async def insert_one(self, *args: Any, **kwargs: Any) -> Any:
+                self.calls.append("insert_one")
+                return await super().insert_one(*args, **kwargs)
+
+            async def find_one_and_update(self, *args: Any, **kwargs: Any) -> Any:
+                self.calls.append("find_one_and_update")
+                return await super().find_one_and_update(*args, **kwargs)
+
+        engine: CountingEngine = CountingEngine()
+        crud: CrudOne = CrudOne(mongo_db, engine=engine)
+        crud.set_collection(collection.CRUD)
+        crud.options.set_upsert(True)
+        crud.options.set_updateChangeLog(False)
+        ID: ObjectId = ObjectId()
+
+        await crud.insert_update({"_id": ID, "one": 1})
+        assertInsert(crud, {"one": 1}, "MSG_SUCCESSFULLY_INSERTED")
+        assert engine.calls == ["find_one_and_update"]
+
+        engine.calls.clear()
+        await crud.insert_update({"_id": ID, "one": 1})
+        assertMessage(crud.get_message(), "MESSAGE_NO_CHANGES_TO_UPDATE")
+        assert engine.calls == ["find_one_and_update"]
+
+        engine.calls.clear()
+        await crud.insert_update({"_id": ID, "one": 2})
+        assertUpdate(crud, {"one": 2}, "MSG_SUCCESSFULLY_UPDATED")
+        assert crud.get_data()["one"] == 2
+        assert engine.calls == ["find_one_and_update", "find_one_and_update"]
+
+        engine.calls.clear()
+        await crud.insert_update({"one": 1})
+        assertInsert(crud, {"one": 1}, "MSG_SUCCESSFULLY_INSERTED")
+        assert engine.calls == ["insert_one"]
+
+        stored: TData = mongo_db[collection.CRUD].find_one({"_id": ID})
+        assert stored["one"] == 2
+        assert stored[CREATE_USER] == {"id": ""}
+        assert MODIFIED_DATE in stored
+
+
+class TestCRUD_UpdateOneMinimalUpdate(TestCRUD_UpdateOne):
+    crud: CrudOne = CrudOne(mongo_db)
+    crud.set_collection(collection.CRUD)
+    crud.options.set_minimalUpdate(True)
+
+
+class TestCRUD_ChangesWithoutChangelog:
+    async def test_full_diff_only_when_needed(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        calculated: List[TData] = []
+        calculate = GetDifferences.calculate
+
+        def recording_calculate(self: GetDifferences, newItem: Any, oldItem: Any) -> None:
+            calculated.append(newItem)
+            calculate(self, newItem, oldItem)
+
+        monkeypatch.setattr(GetDifferences, "calculate", recording_calculate)
+        crud: CrudOne = CrudOne(mongo_db)
+        crud.set_collection(collection.CRUD)
+        await crud.insert_update({"one": 1})
+        ID: ObjectId = crud.get_data()["_id"]
+
+        await crud.insert_update({"_id": ID, "one": 1})
+        assert calculated == []
+
+        crud.options.set_updateChangeLog(False)
+        crud.options.set_minimalUpdate(False)
+        await crud.insert_update({"_id": ID, "one": 2})
+        assert calculated == []
+        assert (await crud.get_by_id(ID))["one"] == 2
+
+        crud.options.set_minimalUpdate(True)
+        await crud.insert_update({"_id": ID, "one": 3})
+        assert len(calculated) == 1
+
+
+class TestCRUD_MinimalUpdate:
+    class RecordingEngine(PymongoEngine):
+        updates: List[Dict] = []
+
+        async def find_one_and_update(
+            self, collection: Any, filter: Dict, update: Dict, **kwargs: Any
+        ) -> Any:
+            self.updates.append(update)
+            return await super().find_one_and_update(collection, filter, update, **kwargs)
+
+    engine: RecordingEngine = RecordingEngine()
+    crud: CrudOne = CrudOne(mongo_db, engine=engine)
+    crud.set_collection(collection.CRUD)
+    crud.options.set_minimalUpdate(True)
+
+    async def insert_and_update(self, entry: TData, changes: TData) -> TData:
+        await self.crud.insert_update(entry)
+        ID: ObjectId = self.crud.get_data()["_id"]
+        self.engine.updates.clear()
+        await self.crud.insert_update({"_id": ID, **changes})
+        assert len(self.engine.updates) == 1
+        return mongo_db[collection.CRUD].find_one({"_id": ID})
+
+    async def test_only_changed_fields_are_set(self) -> None:
+        stored: TData = await self.insert_and_update(
+            {"one": 1, "two": 2, "nested": {"a": 1, "b": 1}},
+            {"one": 10, "nested": {"a": 1, "b": 2}},
+        )
+        assert set(self.engine.updates[0]) == {"$set"}
+        assert set(self.engine.updates[0]["$set"]) == {
+            "one",
+            "nested.b",
+            MODIFIED_USER,
+            MODIFIED_DATE,
+        }
+        assert stored["one"] == 10
+        assert stored["two"] == 2
+        assert stored["nested"] == {"a": 1, "b": 2}
+
+    async def test_removed_nested_field_is_unset(self) -> None:
+        stored: TData = await self.insert_and_update(
+            {"nested": {"a": 1, "b": 1}}, {"nested": {"a": 1}}
+        )
+        assert self.engine.updates[0]["$unset"] == {"nested.b": ""}
+        assert stored["nested"] == {"a": 1}
+
+    async def test_nested_omitted_field_sets_parent(self) -> None:
+        stored: TData = await self.insert_and_update(
+            {"nested": {"a": 1}}, {"nested": {"a": 2, "id": "123"}}
+        )
+        assert self.engine.updates[0]["$set"]["nested"] == {"a": 2, "id": "123"}
+        assert stored["nested"] == {"a": 2, "id": "123"}
+
+    async def test_lists_are_set_whole(self) -> None:
+        stored: TData = await self.insert_and_update({"list": [1, 2]}, {"list": [1, 2, 3]})
+        assert self.engine.updates[0]["$set"]["list"] == [1, 2, 3]
+        assert stored["list"] == [1, 2, 3]
+
+    async def test_ordered_list_changes_by_index(self) -> None:
+        self.crud.options.set_orderedListDiff(True)
+        stored: TData = await self.insert_and_update(
+            {"list": [1, 2], "nested": {"list": [1, 2]}},
+            {"list": [1, 2, 3], "nested": {"list": [0, 1, 2]}},
+        )
+        self.crud.options.set_orderedListDiff(False)
+        assert self.engine.updates[0]["$set"]["list"] == [1, 2, 3]
+        assert self.engine.updates[0]["$set"]["nested"] == {"list": [0, 1, 2]}
+        assert stored["list"] == [1, 2, 3]
+        assert stored["nested"] == {"list": [0, 1, 2]}
+
+        changelog: TData = mongo_db[collection.CHANGELOG].find_one(
+            {"parentID": str(stored["_id"])}, sort=[("_id", -1)]
+        )
+        assert changelog["changeLog"] == [
+            {"field": "list.2", "oldValue": None, "newValue": "3"},
+            {"field": "nested.list.0", "oldValue": None, "newValue": "0"},
+        ]
+
+    async def test_ordered_list_new_order_is_saved(self) -> None:
+        self.crud.options.set_orderedListDiff(True)
+        stored: TData = await self.insert_and_update(
+            {"list": list(range(60))}, {"list": list(range(59, -1, -1))}
+        )
+        self.crud.options.set_orderedListDiff(False)
+        assert stored["list"] == list(range(59, -1, -1))
+
+    def get_update_document(self, original: TData, entry: TData) -> Dict:
+        crud: CrudOne = CrudOne(mongo_db)
+        crud.set_collection(collection.CRUD)
+        crud.options.set_minimalUpdate(True)
+        crud.originalData = original
+        crud.schema = entry
+        diff: GetDifferences = GetDifferences()
+        diff.calculate(entry, original)
+        crud.changes = diff.get_differences()
+        return crud._get_update_document()
+
+    @pytest.mark.parametrize(
+        "original, entry",
+        [
+            ({"address": ""}, {"address": {"street": "Main", "city": "X"}}),
+            ({"address": []}, {"address": {"street": "Main"}}),
+            ({"address": None}, {"address": {"street": "Main"}}),
+            (
+                {"address": {"street": "", "city": "X"}},
+                {"address": {"street": {"name": "Main"}, "city": "X"}},
+            ),
+        ],
+    )
+    def test_fields_are_not_set_inside_values(self, original: TData, entry: TData) -> None:
+        assert self.get_update_document(original, entry) == {"$set": entry}
+
+    def test_missing_parents_are_set_by_path(self) -> None:
+        update: Dict = self.get_update_document(
+            {"address": {"city": "X"}}, {"address": {"city": "X", "street": {"name": "Main"}}}
+        )
+        assert update == {"$set": {"address.street": {"name": "Main"}}}
+
+    async def test_deactivate_date_is_set(self) -> None:
+        stored: TData = await self.insert_and_update({"active": True}, {"active": False})
+        assert DEACTIVATE_DATE in self.engine.updates[0]["$set"]
+        assert stored[DEACTIVATE_DATE] is not None
+
+    async def test_full_document_fallback(self) -> None:
+        self.crud.options.set_minimalUpdate(False)
+        stored: TData = await self.insert_and_update({"one": 1, "two": 2}, {"one": 10})
+        self.crud.options.set_minimalUpdate(True)
+        assert {"_id", "one", "two", CREATE_USER, CREATE_DATE} <= set(
+            self.engine.updates[0]["$set"]
+        )
+        assert stored["one"] == 10
+
+
+class TestCRUD_UpdateOneReads:
+    class CountingEngine(PymongoEngine):
+        reads: int = 0
+
+        async def find_one(self, *args: Any, **kwargs: Any) -> Any:
+            self.reads += 1
+            return await super().find_one(*args, **kwargs)
+
+    async def test_update_reads_once_for_diff(self) -> None:
+        engine: TestCRUD_UpdateOneReads.CountingEngine = self.CountingEngine()
+        crud: CrudOne = CrudOne(mongo_db, engine=engine)
+        crud.set_collection(collection.CRUD)
+        await crud.insert_update({"one": 1})
+        ID: ObjectId = crud.get_data()["_id"]
+
+        engine.reads = 0
+        await crud.insert_update({"_id": ID, "one": 2})
+        assertUpdate(crud, {"one": 2}, "MSG_SUCCESSFULLY_UPDATED")
+        # Original data and changelog read back after insert. The diff reuses the original data
+        assert engine.reads == 2
+
+        changelog: List[TData] = list(mongo_db[collection.CHANGELOG].find({"parentID": str(ID)}))
+        assert changelog[-1]["changeLog"] == [{"field": "one", "oldValue": "1", "newValue": "2"}]
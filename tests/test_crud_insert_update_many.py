@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 from typing import Any, Dict, List
@@ -23,6 +24,7 @@ from _python_core.crud.crud_constants import (
     MODIFIED_DATE,
     MODIFIED_USER,
 )
+from _python_core.crud.crud_engine import PymongoEngine
 from _python_core.crud.crud_many import CrudMany
 from _python_core.crud.crud_options import CrudOptions
 from _python_core.translations import Translations as tr
@@ -367,3 +369,106 @@ def assertData(listSchemas: List[TData], schema: TData) -> None:
 
 def assertMessage(listMessages: List[str], msg: str, lang: str = "en") -> None:
     assert tr.translate(msg, lang)[:30] in listMessages[0]
+
+
+class TestCRUD_InsertManyBulk(TestCRUD_InsertMany):
+    crudMany: CrudMany = CrudMany(mongo_db)
+    crudMany.set_collection(collection.CRUD)
+    crudMany.options.set_bulkWrite(True)
+
+
+class TestCRUD_UpdateManyBulk(TestCRUD_UpdateMany):
+    crudMany: CrudMany = CrudMany(mongo_db)
+    crudMany.set_collection(collection.CRUD)
+    crudMany.options.set_bulkWrite(True)
+
+    async def test_bulk_same_results_as_one_by_one(self) -> None:
+        sequential: CrudMany = CrudMany(mongo_db)
+        sequential.set_collection(collection.CRUD)
+        self.crudMany.set_collection(collection.CRUD)
+        ids: List[ObjectId] = [ObjectId(), ObjectId()]
+        for crudMany, _id in zip([sequential, self.crudMany], ids):
+            await crudMany.insert_update([{"_id": _id, "one": 1}, {"_id": ObjectId(), "two": 2}])
+            await crudMany.insert_update(
+                [{"_id": _id, "one": 2}, {"id": "1"}, {}, {"three": 3}, {"_id": _id, "one": 2}]
+            )
+
+        assert self.crudMany.get_messages() == sequential.get_messages()
+        assert self.crudMany.get_errors() == sequential.get_errors()
+        assert self.crudMany.http_codes == sequential.http_codes
+        assert self.crudMany.http_code == sequential.http_code
+        for bulkData, data in zip(self.crudMany.get_data(), sequential.get_data()):
+            assert {key: bulkData[key] for key in ["one", "three"] if key in bulkData} == {
+                key: data[key] for key in ["one", "three"] if key in data
+            }
+
+        for _id in ids:
+            changelogs = list(mongo_db[collection.CHANGELOG].find({"parentID": str(_id)}))
+            assert [changelog["action"] for changelog in changelogs] == [CREATE, UPDATE]
+            assertChangeLogUpdate(changelogs[1], "one", "1", "2")
+
+    async def test_bulk_same_id_twice_in_batch(self) -> None:
+        self.crudMany.set_collection(collection.CRUD)
+        ID: ObjectId = ObjectId()
+        await self.crudMany.insert_update([{"_id": ID, "one": 1}, {"_id": ID, "one": 2}])
+
+        assert self.crudMany.http_codes == [HTTPCode.CODE_200, HTTPCode.CODE_200]
+        assertMessageUpdateMany(self.crudMany.get_messages()[0], "MSG_SUCCESSFULLY_INSERTED")
+        assertMessageUpdateMany(self.crudMany.get_messages()[1], "MSG_SUCCESSFULLY_UPDATED")
+        assert mongo_db[collection.CRUD].find_one({"_id": ID})["one"] == 2
+
+    async def test_bulk_write_error_is_reported_per_row(self) -> None:
+        mongo_db["bulk"].create_index("code", unique=True)
+        crudMany: CrudMany = CrudMany(mongo_db)
+        crudMany.set_collection("bulk")
+        crudMany.options.set_bulkWrite(True)
+        await crudMany.insert_update([{"code": "A"}, {"code": "A"}, {"code": "B"}])
+
+        assert crudMany.http_codes == [HTTPCode.CODE_200, HTTPCode.CODE_500, HTTPCode.CODE_500]
+        assert crudMany.http_code == HTTPCode.CODE_400
+        assert len(crudMany.get_messages()) == 1
+        assert tr.translate("ERROR_UNKNOWN_MONGO_INSERT")[:-2] in crudMany.get_errors()[0]
+        assert mongo_db["bulk"].count_documents({}) == 1
+        mongo_db.drop_collection("bulk")
+
+
+class TestCRUD_InsertManyConcurrent(TestCRUD_InsertMany):
+    crudMany: CrudMany = CrudMany(mongo_db)
+    crudMany.set_collection(collection.CRUD)
+    crudMany.options.set_concurrency(4)
+
+
+class TestCRUD_UpdateManyConcurrent(TestCRUD_UpdateMany):
+    crudMany: CrudMany = CrudMany(mongo_db)
+    crudMany.set_collection(collection.CRUD)
+    crudMany.options.set_concurrency(4)
+
+    async def test_concurrent_results_keep_input_order(self) -> None:
+        class SlowEngine(PymongoEngine):
+            running: int = 0
+            maxRunning: int = 0
+
+            async def insert_one(self, collection: Any, document: TData) -> Any:
+                SlowEngine.running += 1
+                SlowEngine.maxRunning = max(SlowEngine.maxRunning, SlowEngine.running)
+                await asyncio.sleep(0.01 * document.get("delay", 0))
+                SlowEngine.running -= 1
+                return await super().insert_one(collection, document)
+
+        crudMany: CrudMany = CrudMany(mongo_db, engine=SlowEngine())
+        crudMany.set_collection(collection.CRUD)
+        crudMany.options.set_concurrency(2)
+        entries: List[TData] = [{"delay": 3}, {}, {"id": "1"}, {"delay": 2}, {"delay": 1}]
+        await crudMany.insert_update(entries)
+
+        assert [data["delay"] for data in crudMany.get_data()] == [3, 2, 1]
+        assert crudMany.http_codes == [
+            HTTPCode.CODE_200,
+            HTTPCode.CODE_400,
+            HTTPCode.CODE_400,
+            HTTPCode.CODE_200,
+            HTTPCode.CODE_200,
+        ]
+        assert crudMany.get_errors()[0] == tr.translate("ERROR_EMPTY_SCHEMA")
+        assert tr.translate("ERROR_INVALID_ID")[:-2] in crudMany.get_errors()[1]
+        assert SlowEngine.maxRunning == 2
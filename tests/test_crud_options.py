@@ -1,6 +1,7 @@
 from datetime import datetime
 import os
 import sys
+from types import SimpleNamespace
 from typing import Any, Dict, List
 from _python_core.constants import DATETIME
 
@@ -12,6 +13,7 @@ else:
     from pymongo.database import Database
 
 from bson import ObjectId
+from graphql import parse
 
 CURRENT_FOLDER = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.join(CURRENT_FOLDER, ".."))
@@ -61,6 +63,12 @@ class TestCrudOptions:
         assert optCrud.updateChangeLog is True
         assert optCrud.softDelete is True
         assert optCrud.filterByUser is False
+        assert optCrud.minimalUpdate is False
+        assert optCrud.orderedListDiff is False
+
+    def test_object_minimal_update(self) -> Any:
+        self.optCrud.set_minimalUpdate(True)
+        assert self.optCrud._is_minimal_update_enabled() is True
 
     def test_object_actionChange_create(self) -> Any:
         self.optCrud.set_actionChangeLog("Create")
@@ -168,6 +176,15 @@ class TestCrudOptions:
         self.optCrud.set_projection({"ok": 1})
         assert len(self.optCrud.projection.keys())
 
+    def test_projection_from_set_projectionFromGQL(self) -> None:
+        definitions = parse("{ ref { name code } }").definitions
+        info = SimpleNamespace(
+            field_nodes=[definitions[0].selection_set.selections[0]], fragments={}
+        )
+        self.optCrud.set_projectionFromGQL(info, "active")
+        assert self.optCrud.projection == {"active": 1, "code": 1, "name": 1}
+        self.optCrud.set_projection()
+
     def test_projection_of_from_set_sort(self) -> None:
         crudOptions: Dict = {
             "dateFilter": {
@@ -1,9 +1,11 @@
 import os
 import sys
-from typing import Dict, List
+from types import SimpleNamespace
+from typing import Any, Dict, List
 import pytest
 
-from bson import ObjectId
+from bson import Decimal128, ObjectId
+from graphql import parse
 
 CURRENT_FOLDER = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.join(CURRENT_FOLDER, ".."))
@@ -118,3 +120,54 @@ class TestEntryHasIDAndIsIDValid:
     def test_transform_list_dict_to_list_tuple(self) -> None:
         entry: List[Dict] = [{"key1": "asc"}]
         assert fn.transform_list_dict_to_list_tuple(entry) == [("key1", 1)]
+
+
+def get_info(query: str) -> Any:
+    definitions = parse(query).definitions
+    return SimpleNamespace(
+        field_nodes=[definitions[0].selection_set.selections[0]],
+        fragments={
+            definition.name.value: definition
+            for definition in definitions
+            if definition.kind == "fragment_definition"
+        },
+    )
+
+
+class TestGetProjectionFromInfo:
+    def test_selected_fields(self) -> None:
+        info: Any = get_info("{ ref { id name alias: code project { name } __typename } }")
+        assert fn.get_projection_from_info(info) == {"code": 1, "id": 1, "name": 1, "project": 1}
+
+    def test_fragments(self) -> None:
+        info: Any = get_info(
+            "{ ref { name ...Fields ... on Ref { inline } } } fragment Fields on Ref { fragment }"
+        )
+        assert fn.get_projection_from_info(info) == {"fragment": 1, "inline": 1, "name": 1}
+
+    def test_extra_fields(self) -> None:
+        info: Any = get_info("{ ref { name } }")
+        assert fn.get_projection_from_info(info, "active") == {"active": 1, "name": 1}
+
+    def test_no_selection(self) -> None:
+        info: Any = get_info("{ ref }")
+        assert fn.get_projection_from_info(info) is None
+
+
+class TestFreeze:
+    def test_equal_values_equal_keys(self) -> None:
+        _id: ObjectId = ObjectId()
+        one: Dict = {"a": [1, {"b": _id}], "c": {"d": None}}
+        two: Dict = {"c": {"d": None}, "a": [1, {"b": _id}]}
+
+        assert fn.freeze(one) == fn.freeze(two)
+        assert hash(fn.freeze(one)) == hash(fn.freeze(two))
+
+    def test_different_values_different_keys(self) -> None:
+        assert fn.freeze([1, 2]) != fn.freeze([2, 1])
+        assert fn.freeze({"a": 1}) != fn.freeze([("a", 1)])
+        assert fn.freeze({"a": [1]}) != fn.freeze({"a": {1}})
+
+    def test_unhashable_values(self) -> None:
+        assert fn.freeze(Decimal128("1.1")) == fn.freeze(Decimal128("1.1"))
+        assert fn.freeze(Decimal128("1.1")) != fn.freeze(Decimal128("1.2"))
@@ -1,13 +1,20 @@
+from datetime import datetime
 import os
 import sys
 from typing import Any, Dict, List, Set
 
 import pytest
+from bson import Decimal128, ObjectId
 
 CURRENT_FOLDER = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.join(CURRENT_FOLDER, ".."))
 
-from _python_core.get_differences import GetDifferences, ExceptionDifferentTypes
+from _python_core.get_differences import (
+    GetDifferences,
+    ExceptionDifferentTypes,
+    are_equal,
+    get_list_edits,
+)
 from _python_core.translations import Translations as tr
 
 
@@ -54,6 +61,33 @@ class TestGetDifferences_simple_types(GetDifferencesHelper):
         self.assertDiff(False, False, False)
         self.assertDiff(False, True, True)
 
+    def test_are_equal(self) -> None:
+        _id: ObjectId = ObjectId()
+        assert are_equal(1, 1)
+        assert are_equal(datetime(2024, 1, 1), datetime(2024, 1, 1))
+        assert are_equal(_id, ObjectId(str(_id)))
+        assert not are_equal(1, 2)
+        assert not are_equal(1, 1.0)
+        assert are_equal(1, "1")
+        assert are_equal(Decimal128("1.5"), Decimal128("1.5"))
+
+
+class TestGetDifferences_has_differences(GetDifferencesHelper):
+    def test_has_differences(self) -> None:
+        a: Dict = {"_id": 1, "a": {"b": [1, 2]}, "c": "c"}
+        b: Dict = {"_id": 2, "a": {"b": [2, 1]}, "c": "c"}
+
+        assert not self.diff.has_differences(a, b)
+        assert self.diff.has_differences({**a, "c": "d"}, b)
+        assert self.diff.has_differences({**a, "d": 1}, b)
+        assert self.diff.has_differences({"a": {"b": [1]}}, {"a": {"b": [1, 1]}})
+        assert self.diff.get_differences() == []
+
+    def test_calculate_after_has_differences(self) -> None:
+        self.diff.has_differences({"a": 1}, {"a": 2})
+
+        self.assertDiff({"a": 1, "b": 1}, {"a": 2, "b": 2}, True, 2)
+
 
 class TestGetDifferences_dict(GetDifferencesHelper):
     def test_simple_dict(self) -> None:
@@ -181,6 +215,89 @@ class TestGetDifferences_list(GetDifferencesHelper):
         self.assertDiff(a, b, False, 0)
         self.assert_history(self.diff.changeLog, "", str(b), str(a))
 
+    def test_repeated_elements(self) -> None:
+        a: List = ["labor", "labor", "equipment"]
+        b: List = ["labor", "equipment", "equipment"]
+
+        self.assertDiff(a, b, True, 1)
+        self.assert_history(self.diff.changeLog, "", "['equipment']", "['labor']")
+
+    def test_same_elements_in_other_order(self) -> None:
+        a: List = [{"b": 2, "a": 1}, [1, {"c": 3}], 2]
+        b: List = [2, [1, {"c": 3}], {"a": 1, "b": 2}]
+
+        self.assertDiff(a, b, False)
+
+    def test_long_list_of_dicts(self) -> None:
+        a: List = [{"item": index, "values": [index, str(index)]} for index in range(5000)]
+        b: List = list(reversed(a[1:])) + [{"item": -1, "values": []}]
+
+        self.assertDiff(a, b, True, 1)
+        self.assert_history(
+            self.diff.changeLog,
+            "",
+            "[{'item': -1, 'values': []}]",
+            "[{'item': 0, 'values': [0, '0']}]",
+        )
+
+
+class TestGetDifferences_ordered_lists(GetDifferencesHelper):
+    diff = GetDifferences(orderedLists=True)
+
+    def test_append_to_long_list(self) -> None:
+        b: List = list(range(2000))
+        a: List = b + [2000]
+
+        self.assertDiff({"list": a}, {"list": b}, True, 1)
+        assert self.diff.changeLog == [
+            {"field": "list.2000", "oldValue": None, "newValue": "2000"}
+        ]
+
+    def test_insert_delete_replace(self) -> None:
+        b: List = ["a", "b", "c", "d"]
+        a: List = ["x", "a", "c", "z"]
+
+        self.assertDiff({"list": a}, {"list": b}, True, 3)
+        assert self.diff.changeLog == [
+            {"field": "list.0", "oldValue": None, "newValue": "x"},
+            {"field": "list.1", "oldValue": "b", "newValue": None},
+            {"field": "list.3", "oldValue": "d", "newValue": "z"},
+        ]
+
+    def test_replaced_dicts_are_compared_by_field(self) -> None:
+        b: List = [{"item": 1, "price": 10}, {"item": 2, "price": 20}]
+        a: List = [{"item": 1, "price": 10}, {"item": 2, "price": 25}]
+
+        self.assertDiff({"list": a}, {"list": b}, True, 1)
+        self.assert_history(self.diff.changeLog, "list.1.price", "20", "25")
+
+    def test_other_order_is_a_change(self) -> None:
+        self.assertDiff({"list": [1, 2]}, {"list": [2, 1]}, True)
+        self.assertDiff({"list": [1, 2]}, {"list": [1, 2]}, False)
+        assert self.diff.has_differences({"list": [1, 2]}, {"list": [2, 1]})
+
+    def test_too_many_edits_fall_back_to_whole_list(self) -> None:
+        b: List = list(range(500))
+        a: List = list(range(500, 1000))
+
+        self.assertDiff({"list": a}, {"list": b}, True, 1)
+        self.assert_history(self.diff.changeLog, "list", str(b), str(a))
+
+    def test_other_order_with_too_many_edits(self) -> None:
+        b: List = list(range(60))
+        a: List = list(reversed(b))
+
+        self.assertDiff({"list": a}, {"list": b}, True, 1)
+        assert self.diff.changeLog == [{"field": "list", "oldValue": str(b), "newValue": str(a)}]
+        assert self.diff.has_differences({"list": a}, {"list": b})
+
+    def test_get_list_edits(self) -> None:
+        assert get_list_edits([1, 2, 3], [1, 2, 3]) == []
+        assert get_list_edits([], [1]) == [("insert", None, 0)]
+        assert get_list_edits([1, 2, 3], [1, 3]) == [("delete", 1, None)]
+        assert get_list_edits([1, 2, 3], [1, 4, 3]) == [("replace", 1, 1)]
+        assert get_list_edits([1, 2, 3], [3, 2, 1], maxEdits=3) is None
+
 
 class TestGetDifferences_dict_with_lists(GetDifferencesHelper):
     def test_complex_struct1(self) -> None:
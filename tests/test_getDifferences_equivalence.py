@@ -0,0 +1,131 @@
+from datetime import datetime
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+pytest.importorskip("hypothesis")
+from hypothesis import given, settings, strategies as st
+
+CURRENT_FOLDER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_FOLDER, ".."))
+
+from _python_core.get_differences import GetDifferences, get_list_edits
+import get_differences_legacy as legacy
+
+KEYS = st.sampled_from(["a", "b", "c", "", "id", "_id", "createDate", "omit"])
+SCALARS = st.one_of(
+    st.none(),
+    st.booleans(),
+    st.integers(-3, 3),
+    st.floats(-3, 3, allow_nan=False),
+    st.sampled_from(["a", "b", "1", "True", "None", "id", "omit"]),
+    st.datetimes(datetime(2024, 1, 1), datetime(2024, 1, 3)),
+)
+VALUES = st.recursive(
+    SCALARS,
+    lambda children: st.one_of(
+        st.lists(children, max_size=4), st.dictionaries(KEYS, children, max_size=4)
+    ),
+    max_leaves=12,
+)
+DOCUMENTS = st.dictionaries(KEYS, VALUES, max_size=5)
+
+
+def run_legacy(newItem: Any, oldItem: Any, *omit_fields: str) -> Optional[List]:
+    diff = legacy.GetDifferences("en", *omit_fields)
+    try:
+        diff.calculate(newItem, oldItem)
+    except (IndexError, KeyError, TypeError):
+        return None
+    return diff.get_differences()
+
+
+def assert_same_differences(newItem: Any, oldItem: Any, *omit_fields: str) -> None:
+    expected: Optional[List] = run_legacy(newItem, oldItem, *omit_fields)
+    diff: GetDifferences = GetDifferences("en", *omit_fields)
+    if expected is None:
+        # Mismatched containers: which error comes first depends on the order of the keys
+        with pytest.raises((IndexError, KeyError, TypeError)):
+            diff.calculate(newItem, oldItem)
+        return
+
+    diff.calculate(newItem, oldItem)
+    assert sorted(diff.get_differences(), key=repr) == sorted(expected, key=repr)
+    assert diff.has_differences(newItem, oldItem) is bool(expected)
+
+
+def get_lcs_length(old: List, new: List) -> int:
+    lengths: List[List[int]] = [[0] * (len(new) + 1) for _ in range(len(old) + 1)]
+    for i, x in enumerate(old):
+        for j, y in enumerate(new):
+            lengths[i + 1][j + 1] = (
+                lengths[i][j] + 1 if x == y else max(lengths[i][j + 1], lengths[i + 1][j])
+            )
+    return lengths[-1][-1]
+
+
+def merge(document: Dict, changes: Dict, removed: List[str]) -> Dict:
+    merged: Dict = {**document, **changes}
+    for key in removed:
+        merged.pop(key, None)
+    return merged
+
+
+class TestGetDifferencesEquivalence:
+    @settings(max_examples=200, deadline=None)
+    @given(VALUES, VALUES)
+    def test_any_values(self, newItem: Any, oldItem: Any) -> None:
+        assert_same_differences(newItem, oldItem)
+
+    @settings(max_examples=200, deadline=None)
+    @given(DOCUMENTS, DOCUMENTS, st.lists(KEYS, max_size=2))
+    def test_similar_documents(self, document: Dict, changes: Dict, removed: List[str]) -> None:
+        assert_same_differences(merge(document, changes, removed), document)
+        assert_same_differences(document, merge(document, changes, removed))
+
+    @settings(max_examples=100, deadline=None)
+    @given(DOCUMENTS, DOCUMENTS, st.one_of(st.none(), st.just("omit")))
+    def test_extra_omit_fields(self, newItem: Dict, oldItem: Dict, omit: Optional[str]) -> None:
+        assert_same_differences(newItem, oldItem, *([omit] if omit else []))
+
+    @pytest.mark.parametrize(
+        "newItem, oldItem",
+        [
+            ({"a": {"b": {"c": [1, {"d": 2}]}}}, {"a": {"b": {"c": [{"d": 2}]}}}),
+            ({"": {"id": 1, "b": 1}}, {"": {"id": 2, "c": 1}}),
+            ({"a": 1}, {"a": [1]}),
+            ({"a": {"b": 1}}, {"a": ""}),
+            ({"a": "ab"}, {"a": ["a", "b"]}),
+            ({"a": {"b": 1}}, {"a": [{"b": 1}]}),
+            ({"a": {"b": 1}}, {"a": 1}),
+        ],
+    )
+    def test_examples(self, newItem: Any, oldItem: Any) -> None:
+        assert_same_differences(newItem, oldItem)
+
+
+class TestListEdits:
+    @settings(max_examples=300, deadline=None)
+    @given(st.lists(st.integers(0, 3), max_size=12), st.lists(st.integers(0, 3), max_size=12))
+    def test_shortest_edit_script(self, old: List[int], new: List[int]) -> None:
+        edits = get_list_edits(old, new)
+        changedOld = {i for operation, i, _ in edits if operation != "insert"}
+        changedNew = {j for operation, _, j in edits if operation != "delete"}
+        for operation, i, j in edits:
+            if operation == "replace":
+                assert old[i] != new[j]
+
+        # The elements left untouched are the same in both lists, and as many as possible
+        kept = [x for i, x in enumerate(old) if i not in changedOld]
+        assert kept == [y for j, y in enumerate(new) if j not in changedNew]
+        assert len(kept) == get_lcs_length(old, new)
+
+    @settings(max_examples=100, deadline=None)
+    @given(st.lists(st.integers(0, 3), max_size=12), st.lists(st.integers(0, 3), max_size=12))
+    def test_cut_off(self, old: List[int], new: List[int]) -> None:
+        distance: int = len(old) + len(new) - 2 * get_lcs_length(old, new)
+        assert get_list_edits(old, new, maxEdits=distance) is not None
+        if distance:
+            assert get_list_edits(old, new, maxEdits=distance - 1) is None
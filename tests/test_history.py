@@ -60,6 +60,27 @@ class TestChangelogUpdate:
         assert history.history["projectId"] == ""
         assert history.history["changeLog"] == [{"field": "one", "oldValue": "1", "newValue": "2"}]
 
+    async def test_update_with_original_data(self) -> None:
+        ID = ObjectId()
+        history: History = History({"_id": ID, "one": 2})
+        history.set_collection(collection.CRUD)
+        history.set_original_data({"_id": ID, "one": 1})
+        await history.calculate(mongo_db)
+
+        assert history.history["parentID"] == str(ID)
+        assert history.history["changeLog"] == [{"field": "one", "oldValue": "1", "newValue": "2"}]
+
+    async def test_has_changes(self) -> None:
+        ID = ObjectId()
+        history: History = History({"_id": ID, "one": 1, "modifiedDate": 2})
+        history.set_collection(collection.CRUD)
+        history.set_original_data({"_id": ID, "one": 1, "modifiedDate": 1})
+        assert not await history.has_changes(mongo_db)
+
+        history.entry["one"] = 2
+        assert await history.has_changes(mongo_db)
+        assert history.history["changeLog"] == []
+
 
 class TestChangelogDelete:
     crud: CrudOne = CrudOne(mongo_db)
@@ -0,0 +1,113 @@
+import os
+import sys
+from types import SimpleNamespace
+from typing import Any, Dict
+
+from bson import ObjectId
+
+from conftest import mongo_db
+
+CURRENT_FOLDER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_FOLDER, ".."))
+
+from _python_core.crud.crud_engine import PymongoEngine
+from _python_core.crud.crud_single import CrudOne
+from _python_core.crud.identity_map import IdentityMap
+from _python_core.validator.ExistInDatabase import ExistInDatabase
+
+import mockClass as mc
+
+TData = Dict[str, Any]  # Type object as defined in GQL Schema
+
+
+class collection:
+    CRUD = "crud"
+
+
+class CountingEngine(PymongoEngine):
+    def __init__(self) -> None:
+        self.reads: int = 0
+
+    async def find_one(self, mongo: Any, *args: Any, **kwargs: Any) -> Any:
+        if mongo.name == collection.CRUD:
+            self.reads += 1
+        return await super().find_one(mongo, *args, **kwargs)
+
+
+def get_crud(identityMap: IdentityMap) -> CrudOne:
+    crud: CrudOne = CrudOne(mongo_db, engine=CountingEngine())
+    crud.set_collection(collection.CRUD)
+    crud.set_identity_map(identityMap)
+    return crud
+
+
+class TestIdentityMap:
+    def test_for_context(self) -> None:
+        info = SimpleNamespace(context={})
+        identityMap: IdentityMap = IdentityMap.for_context(info.context)
+        assert IdentityMap.for_context(info.context) is identityMap
+        assert IdentityMap.for_context({}) is not identityMap
+
+    def test_copies(self) -> None:
+        identityMap: IdentityMap = IdentityMap()
+        _id: ObjectId = ObjectId()
+        document: TData = {"_id": _id, "nested": {"one": 1}}
+        identityMap.set(collection.CRUD, _id, document)
+        document["nested"]["one"] = 2
+        identityMap.get(collection.CRUD, str(_id))["nested"]["one"] = 3
+
+        assert identityMap.get(collection.CRUD, _id) == {"_id": _id, "nested": {"one": 1}}
+
+    async def test_each_document_read_once(self) -> None:
+        crud: CrudOne = get_crud(IdentityMap())
+        await crud.insert_update({"identity": 1})
+        _id: ObjectId = crud.get_data()["_id"]
+        assert crud.engine.reads == 1
+
+        await crud.insert_update({"_id": _id, "identity": 2})
+        assert (await crud.get_by_id(_id))["identity"] == 2
+        assert await ExistInDatabase(SimpleNamespace(lang="en", crud=crud)).validate(str(_id))
+        await crud.delete(str(_id))
+        assert crud.engine.reads == 1
+
+        crud.options.set_softDelete(False)
+        await crud.delete(str(_id))
+        assert await crud.get_by_id(_id) is None
+        assert crud.engine.reads == 1
+
+    async def test_missing_document_read_once(self) -> None:
+        crud: CrudOne = get_crud(IdentityMap())
+        _id: ObjectId = ObjectId()
+        assert await crud.get_by_id(_id) is None
+        assert await crud.get_by_id(_id) is None
+        assert crud.engine.reads == 1
+
+        await crud.insert_update({"_id": _id, "identity": 1})
+        assert (await crud.get_by_id(_id))["identity"] == 1
+
+    async def test_without_identity_map(self) -> None:
+        crud: CrudOne = get_crud(None)
+        await crud.insert_update({"identity": 1})
+        _id: ObjectId = crud.get_data()["_id"]
+        await crud.get_by_id(_id)
+        await crud.get_by_id(_id)
+        assert crud.engine.reads == 3
+
+    async def test_shared_by_base_classes(self) -> None:
+        identityMap: IdentityMap = IdentityMap()
+        many = mc.MockManyObjects()
+        many.set_crud(mongo_db, engine=CountingEngine())
+        many.set_identity_map(identityMap)
+        many.set_schemas([{"identity": 1}])
+        await many.insert_update()
+        _id: ObjectId = many.get_data()[0]["_id"]
+
+        single = mc.MockSingleObject()
+        single.set_crud(mongo_db, engine=CountingEngine())
+        single.set_identity_map(identityMap)
+        single.set_schema({"_id": _id, "identity": 2})
+        await single.patch()
+
+        assert single.schema["identity"] == 2
+        assert single.originalData["identity"] == 1
+        assert single.handlerCrudSingle.engine.reads == 0
@@ -0,0 +1,88 @@
+import os
+import sys
+import time
+from typing import Any, Dict
+
+from bson import ObjectId
+
+CURRENT_FOLDER = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(CURRENT_FOLDER, ".."))
+
+from _python_core.reference_cache import ReferenceCache
+
+TData = Dict[str, Any]  # Type object as defined in GQL Schema
+
+COLLECTION = "references"
+
+
+class TestReferenceCache:
+    def test_only_enabled_collections(self) -> None:
+        cache: ReferenceCache = ReferenceCache()
+        cache.set(COLLECTION, "1", {"one": 1})
+        assert cache.get(COLLECTION, "1") is None
+
+        cache.enable(COLLECTION)
+        cache.set(COLLECTION, "1", {"one": 1})
+        assert cache.get(COLLECTION, "1") == {"one": 1}
+
+        cache.disable(COLLECTION)
+        assert cache.get_metrics()["entries"] == 0
+
+    def test_readers_get_their_own_copy(self) -> None:
+        cache: ReferenceCache = ReferenceCache()
+        cache.enable(COLLECTION)
+        _id: ObjectId = ObjectId()
+        cache.set(COLLECTION, _id, {"_id": _id, "nested": {"one": 1}})
+
+        cache.get(COLLECTION, str(_id))["nested"]["one"] = 2
+        assert cache.get(COLLECTION, _id) == {"_id": _id, "nested": {"one": 1}}
+
+    def test_ttl(self) -> None:
+        cache: ReferenceCache = ReferenceCache()
+        cache.enable(COLLECTION, ttl=0.01)
+        cache.set(COLLECTION, "1", {"one": 1})
+        time.sleep(0.02)
+
+        assert cache.get(COLLECTION, "1") is None
+        assert cache.get_metrics()["entries"] == 0
+
+    def test_lru_max_entries(self) -> None:
+        cache: ReferenceCache = ReferenceCache(max_entries=2)
+        cache.enable(COLLECTION)
+        cache.set(COLLECTION, "1", {"one": 1})
+        cache.set(COLLECTION, "2", {"two": 2})
+        cache.get(COLLECTION, "1")
+        cache.set(COLLECTION, "3", {"three": 3})
+
+        assert cache.get(COLLECTION, "2") is None
+        assert cache.get(COLLECTION, "1") == {"one": 1}
+        assert cache.get(COLLECTION, "3") == {"three": 3}
+        assert cache.get_metrics()["evictions"] == 1
+
+    def test_max_bytes(self) -> None:
+        cache: ReferenceCache = ReferenceCache(max_bytes=100)
+        cache.enable(COLLECTION)
+        cache.set(COLLECTION, "big", {"text": "x" * 200})
+        assert cache.get(COLLECTION, "big") is None
+
+        for index in range(5):
+            cache.set(COLLECTION, str(index), {"text": "x" * 20})
+        assert 0 < cache.get_metrics()["bytes"] <= 100
+        assert cache.get(COLLECTION, "4") is not None
+        assert cache.get(COLLECTION, "0") is None
+
+    def test_invalidate(self) -> None:
+        cache: ReferenceCache = ReferenceCache()
+        cache.enable(COLLECTION)
+        cache.enable("other")
+        cache.set(COLLECTION, "1", {"one": 1})
+        cache.set(COLLECTION, "2", {"two": 2})
+        cache.set("other", "1", {"one": 1})
+
+        cache.invalidate(COLLECTION, "1")
+        assert cache.get(COLLECTION, "1") is None
+        assert cache.get(COLLECTION, "2") is not None
+
+        cache.invalidate(COLLECTION)
+        assert cache.get(COLLECTION, "2") is None
+        assert cache.get("other", "1") is not None